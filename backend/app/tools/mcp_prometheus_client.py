@@ -3,6 +3,7 @@
 
 import os
 import json
+import asyncio
 import httpx
 from typing import Dict, Any, Optional
 from pathlib import Path
@@ -158,19 +159,23 @@ class PrometheusMCPClient:
 
 # Global Prometheus MCP client instance
 _prometheus_mcp_client: Optional[PrometheusMCPClient] = None
+_prometheus_mcp_client_lock = asyncio.Lock()
 
 
 async def get_prometheus_mcp_client() -> PrometheusMCPClient:
     """Get or create the Prometheus MCP client"""
     global _prometheus_mcp_client
-    if _prometheus_mcp_client is None:
-        _prometheus_mcp_client = PrometheusMCPClient()
-        success = await _prometheus_mcp_client.start_server()
-        if not success:
-            print("[MCP-Prometheus] Failed to initialize Prometheus MCP client")
-            # Don't cache failed clients
-            _prometheus_mcp_client = None
-            raise Exception("Prometheus MCP server not accessible")
+    # Concurrent callers wait for the first one to finish connecting instead of
+    # picking up a client whose start_server() has not completed
+    async with _prometheus_mcp_client_lock:
+        if _prometheus_mcp_client is None:
+            client = PrometheusMCPClient()
+            success = await client.start_server()
+            if not success:
+                print("[MCP-Prometheus] Failed to initialize Prometheus MCP client")
+                # Don't cache failed clients
+                raise Exception("Prometheus MCP server not accessible")
+            _prometheus_mcp_client = client
     return _prometheus_mcp_client
 
 
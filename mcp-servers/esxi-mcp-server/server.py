@@ -1,10 +1,23 @@
 import os
 import json
+import asyncio
 import logging
 import ssl
+import time
 import argparse
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+import threading
+import functools
+import inspect
+import queue
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from contextlib import contextmanager
+from collections import OrderedDict
+from cachetools import TTLCache
+import orjson
+import fastjsonschema
+from typing import Optional, Dict, Any, List, Tuple
 
 # MCP protocol related imports
 from mcp.server.lowlevel import Server  # MCP server base class
@@ -14,8 +27,11 @@ from mcp import types  # MCP type definitions
 from pyVim import connect
 from pyVmomi import vim, vmodl
 
-# Configuration data class for storing configuration options
-@dataclass
+# Task states after which a vCenter task no longer changes
+_TERMINAL_STATES = frozenset((vim.TaskInfo.State.success, vim.TaskInfo.State.error))
+
+# Configuration data class for storing configuration options (immutable, usable as a cache key)
+@dataclass(slots=True, frozen=True)
 class Config:
     vcenter_host: str
     vcenter_user: str
@@ -25,9 +41,28 @@ class Config:
     datastore: Optional[str] = None    # Datastore name (optional)
     network: Optional[str] = None      # Virtual network name (optional)
     insecure: bool = False             # Whether to skip SSL certificate verification (default: False)
+    server_pem_cert: Optional[str] = None  # Path to the vCenter/ESXi certificate (PEM) to pin instead of skipping verification
     log_file: Optional[str] = None     # Log file path (if not specified, output to console)
     log_level: str = "INFO"            # Log level
     port: int = 8080                   # Server port (default: 8080)
+    max_connections: int = 20          # Maximum concurrent vCenter sessions
+    max_keepalive_connections: int = 10  # Idle sessions kept logged in for reuse
+    keepalive_expiry: float = 300.0    # Seconds an idle session is kept before its connection is closed
+    pool_timeout: float = 5.0          # Seconds to wait for a free session before failing the call
+    cache_ttl_seconds: float = 5.0     # Seconds list/performance results are served from cache
+    pool_size: int = 4                 # vCenter sessions opened at startup and kept connected while idle
+    poll_min: float = 0.025            # First delay (seconds) when polling task state without WaitForUpdatesEx
+    poll_max: float = 1.0              # Upper bound for the task polling delay
+    poll_multiplier: float = 2.0       # Factor the polling delay grows by after each check
+    max_body_bytes: int = 1048576      # Largest accepted /mcp request body; bigger ones get 413
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Hash once; the config is read-only and used as a dict key on every connect
+        object.__setattr__(self, "_hash", hash(tuple(getattr(self, f.name) for f in fields(self) if f.compare)))
+
+    def __hash__(self):
+        return self._hash
 
 # VMware management class for stateless operations
 # class VMwareManager:
@@ -475,8 +510,81 @@ class Config:
 #             # Always disconnect after operation
 #             if hasattr(self, 'si') and self.si:
 #                 connect.Disconnect(self.si)
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context(config: Config) -> ssl.SSLContext:
+    """TLS settings for vCenter, built once per configuration and shared by every connection."""
+    if config.server_pem_cert:
+        # Pinned certificate: trust exactly the configured server certificate
+        with open(config.server_pem_cert) as f:
+            context = ssl.create_default_context(cadata=f.read())
+        context.check_hostname = False
+    elif config.insecure:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        # Loading the system CA bundle is the expensive part, so do it once
+        context = ssl.create_default_context()
+    return context
+
+# Decorator for VMwareManager operations that need a live session
+def requires_connection(fn):
+    """Ensure the manager is connected before running a VMwareManager operation."""
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        self._ensure_alive()
+        assert all(obj is not None for obj in (self.si, self.content, self.datacenter_obj, self.resource_pool))
+        return fn(self, *args, **kwargs)
+    return wrapper
+
+# Keeps an idle vCenter session authenticated (the server drops it after 30 minutes)
+class _KeepAlive(threading.Thread):
+    def __init__(self, si, interval: float = 600):
+        super().__init__(name="vcenter-keepalive", daemon=True)
+        self.si = si
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.si.CurrentTime()  # Cheapest authenticated call
+            except Exception as e:
+                logging.warning(f"vCenter keep-alive failed: {e}")
+                return
+
+    def stop(self):
+        self._stop_event.set()
+
 # VMware management class for stateless operations
 class VMwareManager:
+    # Seconds a resolved VM reference stays in the name lookup cache
+    VM_CACHE_TTL = 60
+    # Most VM references kept in the lookup cache (least recently used are dropped first)
+    VM_CACHE_SIZE = 512
+    # Inventory objects resolved during connect, reused across reconnects
+    INVENTORY_ATTRS = ("datacenter_obj", "resource_pool", "datastore_obj", "network_obj")
+    # Config -> {attr: (managed object type, moId) or None}
+    _inventory_cache: Dict[Config, Dict[str, Any]] = {}
+    # Push-updated VM stats shared by all managers, set once the pool starts it
+    stats_cache: Optional["VMStatsCache"] = None
+    # Performance counters reported as network usage (transmit, receive)
+    NET_COUNTERS = ("net.transmitted.average", "net.received.average")
+    # Where session ids are kept between connections and restarts, per user@host
+    SESSION_FILE = os.path.expanduser("~/.esxi_mcp_session")
+    # user@host keys whose stored session id is already used by a manager in this process;
+    # every other manager logs in to a session of its own
+    _stored_session_claims: set = set()
+    _claims_lock = threading.Lock()
+    # Objects per RetrievePropertiesEx page
+    PROPERTY_PAGE_SIZE = 1000
+    # Seconds after a successful vCenter call during which the session is taken as alive without a probe
+    SESSION_CHECK_INTERVAL = 60
+    # VM properties fetched for bulk listings
+    BULK_VM_PROPS = ["name", "runtime.powerState", "summary.quickStats.overallCpuUsage",
+                     "summary.quickStats.guestMemoryUsage", "summary.storage.committed"]
+
     def __init__(self, config: Config):
         self.config = config
         self.si = None
@@ -485,187 +593,471 @@ class VMwareManager:
         self.resource_pool = None
         self.datastore_obj = None
         self.network_obj = None
-
-    def _connect_vcenter(self):
-        """Connect to vCenter/ESXi and retrieve main resource object references."""
-        # Check if we already have a healthy session
-        if self.si and self.content:
+        self._vm_cache: OrderedDict = OrderedDict()  # (datacenter moId, VM name) -> (VirtualMachine, expiry)
+        self._keepalive: Optional[_KeepAlive] = None
+        # Serializes connect/reset; re-entrant because connect resets a dead session
+        self._conn_lock = threading.RLock()
+        self._ready = False  # Set once connect has resolved the inventory objects
+        self._last_success = 0.0  # time.monotonic() of the last call vCenter answered
+        self._owns_stored_session = False  # Set on the one manager that resumes and saves the stored session id
+        self._counter_map: Dict[str, int] = {}  # "group.name.rollup" -> perf counter id
+        self._ds_by_name: Dict[str, vim.Datastore] = {}
+        self._net_by_name: Dict[str, vim.Network] = {}
+
+    def _session_alive(self) -> bool:
+        """Return True if the current session still answers.
+
+        vCenter is only probed when nothing succeeded in the last SESSION_CHECK_INTERVAL
+        seconds; an expiry in between is handled by the session-oriented stub's re-login
+        and by _call resetting on NotAuthenticated.
+        """
+        if self._ready:
+            if time.monotonic() - self._last_success < self.SESSION_CHECK_INTERVAL:
+                return True
             try:
-                session_manager = self.content.sessionManager
-                if session_manager.currentSession:
-                    return 
+                # Cheapest call there is; an expired login is renewed by the session-oriented stub
+                self.si.CurrentTime()
+                self._last_success = time.monotonic()
+                return True
             except:
-                self._reset_connection_state()
-
-        try:
-            if self.config.insecure:
-                context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                self.si = connect.SmartConnect(
-                    host=self.config.vcenter_host,
-                    user=self.config.vcenter_user,
-                    pwd=self.config.vcenter_password,
-                    sslContext=context)
-            else:
-                self.si = connect.SmartConnect(
-                    host=self.config.vcenter_host,
-                    user=self.config.vcenter_user,
-                    pwd=self.config.vcenter_password)
+                pass
+        return False
 
-            self.content = self.si.RetrieveContent()
-            
-            # Setup Datacenter
-            if self.config.datacenter:
-                self.datacenter_obj = next((dc for dc in self.content.rootFolder.childEntity
-                                            if isinstance(dc, vim.Datacenter) and dc.name == self.config.datacenter), None)
-            else:
-                self.datacenter_obj = next((dc for dc in self.content.rootFolder.childEntity
-                                          if isinstance(dc, vim.Datacenter)), None)
-            
-            if not self.datacenter_obj:
-                raise Exception("No datacenter object found")
+    def _ensure_alive(self):
+        """Return at once on a live session, otherwise reconnect."""
+        if not self._session_alive():
+            self._connect_vcenter()
 
-            # Setup Compute Resource / Resource Pool
-            if self.config.cluster:
-                compute_resource = next((folder for folder in self.datacenter_obj.hostFolder.childEntity 
-                                       if isinstance(folder, vim.ClusterComputeResource) and folder.name == self.config.cluster), None)
-            else:
-                compute_resource = next((cr for cr in self.datacenter_obj.hostFolder.childEntity
-                                      if isinstance(cr, vim.ComputeResource)), None)
-            
-            if not compute_resource:
-                raise Exception("No compute resource found")
-            self.resource_pool = compute_resource.resourcePool
-
-            # Setup Datastore
-            if self.config.datastore:
-                self.datastore_obj = next((ds for ds in self.datacenter_obj.datastoreFolder.childEntity
-                                       if isinstance(ds, vim.Datastore) and ds.name == self.config.datastore), None)
-            else:
-                datastores = [ds for ds in self.datacenter_obj.datastoreFolder.childEntity if isinstance(ds, vim.Datastore)]
-                if datastores:
-                    self.datastore_obj = max(datastores, key=lambda ds: ds.summary.freeSpace)
-            
-            # Setup Network
-            if self.config.network:
-                networks = self.datacenter_obj.networkFolder.childEntity
-                self.network_obj = next((net for net in networks if net.name == self.config.network), None)
+    def _index_inventory(self):
+        """Map datastore and network names to MoRefs, one PropertyCollector call per folder."""
+        self._ds_by_name = {obj.propSet[0].val: obj.obj for obj in
+                            self._collect_properties(vim.Datastore, ["name"], self.datacenter_obj.datastoreFolder)}
+        self._net_by_name = {obj.propSet[0].val: obj.obj for obj in
+                             self._collect_properties(vim.Network, ["name"], self.datacenter_obj.networkFolder)}
 
-            logging.info("VMware connection established.")
+    def _connect_vcenter(self):
+        """Connect to vCenter/ESXi and retrieve main resource object references."""
+        # Fast path without the lock: concurrent calls on a healthy session don't contend
+        if self._session_alive():
+            return
+        with self._conn_lock:
+            # Another thread may have reconnected while we waited for the lock
+            if self._session_alive():
+                return
+            if self.si:
+                self._reset_connection_state()
 
-        except Exception as e:
-            logging.error(f"Failed to connect: {e}")
-            raise
+            try:
+                # The first manager resumes the last session if vCenter still knows it, the others
+                # get their own. The session-oriented stub only logs in when there is no valid
+                # session, and again whenever it expires
+                self._claim_stored_session()
+                soap_stub = connect.SmartStubAdapter(
+                    host=self.config.vcenter_host,
+                    sslContext=_ssl_context(self.config),
+                    connectionPoolTimeout=-1,
+                    sessionId=self._load_session_id() if self._owns_stored_session else None)
+                login = connect.VimSessionOrientedStub.makeUserLoginMethod(
+                    self.config.vcenter_user, self.config.vcenter_password)
+                self.si = vim.ServiceInstance("ServiceInstance", connect.VimSessionOrientedStub(soap_stub, login))
+
+                self.content = self.si.RetrieveContent()
+                if self._owns_stored_session:
+                    self._save_session_id(soap_stub.GetSessionId())
+                self._keepalive = _KeepAlive(self.si)
+                self._keepalive.start()
+
+                # Counter ids are fixed per vCenter, so the (large) perfCounter list is fetched only once
+                if not self._counter_map:
+                    self._counter_map = {f"{c.groupInfo.key}.{c.nameInfo.key}.{c.rollupType}": c.key
+                                         for c in self.content.perfManager.perfCounter}
+
+                # Reuse the inventory resolved by an earlier connection with the same configuration
+                cached = VMwareManager._inventory_cache.get(self.config)
+                if cached:
+                    for attr, ref in cached.items():
+                        setattr(self, attr, ref[0](ref[1], self.si._stub) if ref else None)
+                    self._index_inventory()
+                    self._ready = True
+                    self._last_success = time.monotonic()
+                    logging.info("VMware connection established (cached inventory).")
+                    return
+
+                # Setup Datacenter
+                self.datacenter_obj = self._find_first(vim.Datacenter, self.content.rootFolder, self.config.datacenter)
+                if not self.datacenter_obj:
+                    raise Exception("No datacenter object found")
+
+                # Setup Compute Resource / Resource Pool
+                if self.config.cluster:
+                    compute_resource = self._find_first(vim.ClusterComputeResource, self.datacenter_obj.hostFolder,
+                                                        self.config.cluster)
+                else:
+                    compute_resource = self._find_first(vim.ComputeResource, self.datacenter_obj.hostFolder)
+                if not compute_resource:
+                    raise Exception("No compute resource found")
+                self.resource_pool = compute_resource.resourcePool
+
+                # Setup Datastore
+                if self.config.datastore:
+                    self.datastore_obj = self._find_first(vim.Datastore, self.datacenter_obj.datastoreFolder,
+                                                          self.config.datastore)
+                else:
+                    # Free space of every datastore in one round trip rather than one summary fetch each
+                    datastores = self._collect_properties(vim.Datastore, ["summary.freeSpace"],
+                                                          self.datacenter_obj.datastoreFolder)
+                    if datastores:
+                        self.datastore_obj = max(datastores, key=lambda ds: ds.propSet[0].val).obj
+
+                # Setup Network
+                if self.config.network:
+                    self.network_obj = self._find_first(vim.Network, self.datacenter_obj.networkFolder,
+                                                        self.config.network)
+                self._index_inventory()
+
+                inventory = {}
+                for attr in self.INVENTORY_ATTRS:
+                    obj = getattr(self, attr)
+                    inventory[attr] = (type(obj), obj._moId) if obj is not None else None
+                VMwareManager._inventory_cache[self.config] = inventory
+                self._ready = True
+                self._last_success = time.monotonic()
+                logging.info("VMware connection established.")
+
+            except Exception as e:
+                logging.error(f"Failed to connect: {e}")
+                raise
+
+    def _session_key(self) -> str:
+        return f"{self.config.vcenter_user}@{self.config.vcenter_host}"
+
+    def _claim_stored_session(self):
+        """Make this manager the user of the stored session id unless another one already is."""
+        with VMwareManager._claims_lock:
+            if self._session_key() not in VMwareManager._stored_session_claims:
+                VMwareManager._stored_session_claims.add(self._session_key())
+                self._owns_stored_session = True
+
+    def _load_session_id(self) -> Optional[str]:
+        """Return the session id saved by an earlier connection, if any."""
+        try:
+            with open(self.SESSION_FILE) as f:
+                return json.load(f).get(self._session_key())
+        except (OSError, ValueError):
+            return None
+
+    def _save_session_id(self, session_id: Optional[str]):
+        """Persist the session id so the next connection (or restart) can skip the login."""
+        if not session_id:
+            return
+        try:
+            try:
+                with open(self.SESSION_FILE) as f:
+                    sessions = json.load(f)
+            except (OSError, ValueError):
+                sessions = {}
+            sessions[self._session_key()] = session_id
+            # Owner-only file, replaced atomically since pooled managers may write concurrently
+            tmp_path = f"{self.SESSION_FILE}.{os.getpid()}.{threading.get_ident()}"
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump(sessions, f)
+            os.replace(tmp_path, self.SESSION_FILE)
+        except OSError as e:
+            logging.warning(f"Could not save vCenter session id: {e}")
 
     def _reset_connection_state(self):
         """Reset connection state to force a fresh connection."""
-        if self.si:
-            try:
-                connect.Disconnect(self.si)
-            except:
-                pass
-        self.si = None
-        self.content = None
+        with self._conn_lock:
+            if self._keepalive:
+                self._keepalive.stop()
+                self._keepalive = None
+            if self.si:
+                # VimSessionOrientedStub wraps the SOAP stub that owns the connection pool
+                soap_stub = getattr(self.si._stub, "soapStub", self.si._stub)
+                if not self._owns_stored_session and self.content:
+                    # A session of its own would otherwise stay open on vCenter until it times out.
+                    # Logged out on the plain stub, so an expired session isn't logged in again first
+                    try:
+                        vim.SessionManager(self.content.sessionManager._moId, soap_stub).Logout()
+                    except:
+                        pass
+                # The stored session is not logged out, so its id on disk stays reusable
+                try:
+                    soap_stub.DropConnections()
+                except:
+                    pass
+            self._ready = False
+            self._last_success = 0.0
+            self.si = None
+            self.content = None
+            # Cached references are bound to the old session
+            self._vm_cache.clear()
+
+    def _evict_inventory(self):
+        """Forget the cached inventory so the next connect resolves it again."""
+        VMwareManager._inventory_cache.pop(self.config, None)
+
+    def _call(self, fn, *args):
+        """Run an operation, dropping cached state when the session or an inventory object is gone."""
+        try:
+            result = fn(*args)
+        except (vim.fault.NotAuthenticated, vmodl.fault.ManagedObjectNotFound):
+            self._evict_inventory()
+            self._reset_connection_state()
+            raise
+        self._last_success = time.monotonic()
+        return result
 
-    def list_vms(self) -> list:
-        """List all virtual machine names."""
-        self._connect_vcenter()
-        
-        vm_list = []
-        container = None
+    def _collect_properties(self, obj_type, path_set: list, root) -> list:
+        """Retrieve path_set for every obj_type object under root with paged PropertyCollector calls."""
+        container = self.content.viewManager.CreateContainerView(root, [obj_type], True)
         try:
-            container = self.content.viewManager.CreateContainerView(
-                self.datacenter_obj, [vim.VirtualMachine], True
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+                name="traverseView", path="view", skip=False, type=vim.view.ContainerView
             )
-            for vm in container.view:
-                vm_list.append(vm.name)
+            object_spec = vmodl.query.PropertyCollector.ObjectSpec(
+                obj=container, skip=True, selectSet=[traversal_spec]
+            )
+            property_spec = vmodl.query.PropertyCollector.PropertySpec(
+                type=obj_type, pathSet=path_set, all=False
+            )
+            filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+                objectSet=[object_spec], propSet=[property_spec]
+            )
+            return self._retrieve_all(filter_spec)
         finally:
-            if container:
-                container.Destroy()
-            # Note: Do NOT disconnect here if you plan to reuse the manager, 
-            # but since your tools create a fresh manager each time, it's okay to let python GC handle it
-            # or explicitly disconnect in the Tool function wrapper.
-        return vm_list
-
-    def find_vm(self, name: str) -> Optional[vim.VirtualMachine]:
-        """Find virtual machine object by name."""
-        # Check connection first
-        self._connect_vcenter()
-        
-        vm_obj = None
-        container = None
+            container.Destroy()
+
+    def _retrieve_all(self, filter_spec) -> list:
+        """Run filter_spec with RetrievePropertiesEx, following continuation tokens page by page."""
+        collector = self.content.propertyCollector
+        options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=self.PROPERTY_PAGE_SIZE)
+        result = collector.RetrievePropertiesEx([filter_spec], options)
+        objects = []
+        while result:
+            objects.extend(result.objects)
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(result.token)
+        return objects
+
+    def _object_properties(self, obj, path_set: list) -> Dict[str, Any]:
+        """Retrieve path_set of a single managed object in one call; unset properties are omitted."""
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+            objectSet=[vmodl.query.PropertyCollector.ObjectSpec(obj=obj, skip=False)],
+            propSet=[vmodl.query.PropertyCollector.PropertySpec(type=type(obj), pathSet=path_set, all=False)]
+        )
+        return {prop.name: prop.val for content in self._retrieve_all(filter_spec) for prop in content.propSet}
+
+    def _find_first(self, obj_type, root, name: Optional[str] = None):
+        """Return the first obj_type object under root, or the one called name if given."""
+        if name:
+            # Names of the matching type only, in a single call
+            return next((obj.obj for obj in self._collect_properties(obj_type, ["name"], root)
+                         if obj.propSet[0].val == name), None)
+        # The container view is filtered by type on the server
+        view = self.content.viewManager.CreateContainerView(root, [obj_type], True)
         try:
-            container = self.content.viewManager.CreateContainerView(
-                self.datacenter_obj, [vim.VirtualMachine], True
-            )
-            for vm in container.view:
-                if vm.name == name:
-                    vm_obj = vm
-                    break
+            return next(iter(view.view), None)
         finally:
-            if container:
-                container.Destroy()
-            # CRITICAL FIX: Do NOT Disconnect(self.si) here!
-            # Returning the vm_obj requires the session to stay open.
+            view.Destroy()
+
+    @requires_connection
+    def list_vms(self) -> list:
+        """List all virtual machine names."""
+        # One round trip for the whole inventory instead of one per vm.name access
+        return [obj.propSet[0].val
+                for obj in self._collect_properties(vim.VirtualMachine, ["name"], self.datacenter_obj)]
+
+    def _bulk_runtime(self) -> List[Dict[str, Any]]:
+        """Power state and quick stats of every VM, fetched in one PropertyCollector call."""
+        vms = []
+        for obj in self._collect_properties(vim.VirtualMachine, self.BULK_VM_PROPS, self.datacenter_obj):
+            # Unset properties are omitted from propSet
+            props = {prop.name: prop.val for prop in obj.propSet}
+            vms.append({
+                "name": props.get("name"),
+                "power_state": str(props.get("runtime.powerState")),
+                "cpu_usage": props.get("summary.quickStats.overallCpuUsage"),
+                "memory_usage": props.get("summary.quickStats.guestMemoryUsage"),
+                "storage_usage": round(props.get("summary.storage.committed", 0) / (1024**3), 2),
+            })
+        return vms
+
+    @requires_connection
+    def list_vms_detailed(self) -> List[Dict[str, Any]]:
+        """List all virtual machines with power state and resource usage."""
+        return self._bulk_runtime()
+
+    @requires_connection
+    def bulk_perf(self, names: Tuple[str, ...] = ()) -> Dict[str, Dict[str, Any]]:
+        """Retrieve CPU, memory and storage usage for the named VMs (all VMs if names is empty)."""
+        stats = {}
+        for vm in self._bulk_runtime():
+            name = vm.pop("name")
+            if not names or name in names:
+                stats[name] = vm
+        return stats
 
+    @requires_connection
+    def find_vm(self, name: str) -> Optional[vim.VirtualMachine]:
+        """Find virtual machine object by name (or inventory path relative to the VM folder)."""
+        return self._find_vm(name)
+
+    def _find_vm(self, name: str) -> Optional[vim.VirtualMachine]:
+        """find_vm for callers that already hold a live connection."""
+        key = (self.datacenter_obj._moId, name)
+        cached = self._vm_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            self._vm_cache.move_to_end(key)
+            return cached[0]
+
+        search_index = self.content.searchIndex
+        if "/" in name:
+            # "folder/vm" style names resolve directly by inventory path
+            vm_obj = search_index.FindByInventoryPath(f"{self.datacenter_obj.name}/vm/{name}")
+        else:
+            # SearchIndex resolves the name on the server in a single call
+            vm_obj = search_index.FindChild(self.datacenter_obj.vmFolder, name)
+            if not isinstance(vm_obj, vim.VirtualMachine):
+                # VMs in nested folders are not direct children of vmFolder, match on names fetched in one call
+                vm_obj = self._find_first(vim.VirtualMachine, self.datacenter_obj, name)
+        if not isinstance(vm_obj, vim.VirtualMachine):
+            return None
+
+        self._vm_cache[key] = (vm_obj, time.monotonic() + self.VM_CACHE_TTL)
+        if len(self._vm_cache) > self.VM_CACHE_SIZE:
+            self._vm_cache.popitem(last=False)
         return vm_obj
 
-    def get_vm_performance(self, vm_name: str) -> Dict[str, Any]:
-        """Retrieve performance data."""
-        self._connect_vcenter()
-        
-        vm = self.find_vm(vm_name)
+    def _get_vm_props(self, name: str, props: Tuple[str, ...] = ("runtime.powerState",)) -> Dict[str, Any]:
+        """Resolve a VM by name and fetch props in one PropertyCollector call; the MoRef is under "obj"."""
+        vm = self._find_vm(name)
         if not vm:
-            raise Exception(f"VM {vm_name} not found")
+            raise Exception(f"VM {name} not found")
+        data = self._object_properties(vm, list(props))
+        data["obj"] = vm
+        return data
 
+    def _forget_vm(self, name: str):
+        """Drop a cached VM reference after the VM was created, cloned or deleted."""
+        self._vm_cache.pop((self.datacenter_obj._moId, name), None)
+
+    @requires_connection
+    def get_vm_performance(self, vm_name: str) -> Dict[str, Any]:
+        """Retrieve performance data."""
         stats = {}
-        qs = vm.summary.quickStats
-        stats["cpu_usage"] = qs.overallCpuUsage
-        stats["memory_usage"] = qs.guestMemoryUsage
-        
-        committed = vm.summary.storage.committed if vm.summary.storage else 0
+        props = self.stats_cache.get(vm_name) if self.stats_cache else None
+        if props:
+            # Rebind the cached reference to this manager's session
+            vm = vim.VirtualMachine(props["obj"]._moId, self.si._stub)
+        else:
+            # Not in the push-updated cache: only the three values needed, in one round trip
+            props = self._get_vm_props(vm_name, ("summary.quickStats.overallCpuUsage",
+                                                 "summary.quickStats.guestMemoryUsage",
+                                                 "summary.storage.committed"))
+            vm = props["obj"]
+        stats["cpu_usage"] = props.get("summary.quickStats.overallCpuUsage")
+        stats["memory_usage"] = props.get("summary.quickStats.guestMemoryUsage")
+
+        committed = props.get("summary.storage.committed", 0)
         stats["storage_usage"] = round(committed / (1024**3), 2)
-        
+
+        # Network usage from the latest sample, aggregated over all NICs (instance="")
+        stats["network_transmit_KBps"] = None
+        stats["network_receive_KBps"] = None
+        try:
+            transmit_id, receive_id = (self._counter_map[n] for n in self.NET_COUNTERS)
+            query = vim.PerformanceManager.QuerySpec(
+                maxSample=1, entity=vm,
+                metricId=[vim.PerformanceManager.MetricId(counterId=cid, instance="")
+                          for cid in (transmit_id, receive_id)])
+            stats_res = self.content.perfManager.QueryStats(querySpec=[query])
+            if stats_res:
+                for series in stats_res[0].value:
+                    if series.id.counterId == transmit_id:
+                        stats["network_transmit_KBps"] = sum(series.value)
+                    elif series.id.counterId == receive_id:
+                        stats["network_receive_KBps"] = sum(series.value)
+        except Exception as e:
+            logging.warning(f"Failed to retrieve network performance data: {e}")
+
         return stats
 
+    @requires_connection
     def create_vm(self, name: str, cpus: int, memory_mb: int, datastore: Optional[str] = None, network: Optional[str] = None) -> str:
         """Create a new virtual machine."""
-        self._connect_vcenter()
-        
         # Use existing objects setup in _connect_vcenter, or override if args provided
         ds_obj = self.datastore_obj
         if datastore:
-            ds_obj = next((ds for ds in self.datacenter_obj.datastoreFolder.childEntity
-                         if isinstance(ds, vim.Datastore) and ds.name == datastore), None)
+            ds_obj = self._ds_by_name.get(datastore)
             if not ds_obj:
                 raise Exception(f"Datastore {datastore} not found")
 
         net_obj = self.network_obj
         if network:
-             networks = self.datacenter_obj.networkFolder.childEntity
-             net_obj = next((net for net in networks if net.name == network), None)
+            net_obj = self._net_by_name.get(network)
 
-        # Build ConfigSpec (kept largely the same as your code)
+        # Names come from the connect-time index, so building the spec costs no round trips
+        ds_name = datastore or self._inventory_name(self._ds_by_name, ds_obj)
+        if ds_obj is None or ds_name is None:
+            raise Exception("No datastore available")
         vm_spec = vim.vm.ConfigSpec(name=name, memoryMB=memory_mb, numCPUs=cpus, guestId="otherGuest")
-        vm_spec.files = vim.vm.FileInfo(vmPathName=f"[{ds_obj.name}] {name}/")
-        
-        # Add Devices (Disk/Network) logic here...
-        # [Abbreviated for brevity, paste your specific device creation code here]
-        # ...
+        vm_spec.files = vim.vm.FileInfo(vmPathName=f"[{ds_name}] {name}/")
+        # Controller, disk and NIC go into the same spec: one CreateVM_Task, no follow-up reconfigure
+        vm_spec.deviceChange = self._device_specs(ds_obj, net_obj, network)
 
         # Execute
         vm_folder = self.datacenter_obj.vmFolder
         task = vm_folder.CreateVM_Task(config=vm_spec, pool=self.resource_pool)
         self._wait_for_task(task)
+        self._forget_vm(name)
         
         return f"VM '{name}' created."
 
+    @staticmethod
+    def _inventory_name(by_name: Dict[str, Any], obj) -> Optional[str]:
+        """Reverse lookup in a name -> MoRef index built by _index_inventory."""
+        return next((name for name, ref in by_name.items() if ref == obj), None)
+
+    def _device_specs(self, ds_obj, net_obj, network: Optional[str] = None) -> list:
+        """SCSI controller, 10 GB thin disk and (if a network is given) a VMXNET3 adapter."""
+        add = vim.vm.device.VirtualDeviceSpec.Operation.add
+        # Temporary negative key lets the disk reference the controller within the same spec
+        controller = vim.vm.device.ParaVirtualSCSIController(
+            key=-101, busNumber=0, sharedBus=vim.vm.device.VirtualSCSIController.Sharing.noSharing,
+            deviceInfo=vim.Description(label="SCSI Controller", summary="ParaVirtual SCSI Controller"))
+        disk = vim.vm.device.VirtualDisk(
+            capacityInKB=1024 * 1024 * 10, controllerKey=controller.key, unitNumber=0,
+            deviceInfo=vim.Description(label="Hard Disk 1", summary="10 GB disk"),
+            backing=vim.vm.device.VirtualDisk.FlatVer2BackingInfo(
+                diskMode="persistent", thinProvisioned=True, datastore=ds_obj))
+        specs = [
+            vim.vm.device.VirtualDeviceSpec(operation=add, device=controller),
+            vim.vm.device.VirtualDeviceSpec(operation=add, device=disk,
+                                            fileOperation=vim.vm.device.VirtualDeviceSpec.FileOperation.create),
+        ]
+        if net_obj:
+            net_name = network or self._inventory_name(self._net_by_name, net_obj)
+            # Portgroups subclass vim.Network, so check for them first
+            if isinstance(net_obj, vim.dvs.DistributedVirtualPortgroup):
+                props = self._object_properties(net_obj, ["key", "config.distributedVirtualSwitch"])
+                switch_uuid = self._object_properties(props["config.distributedVirtualSwitch"], ["uuid"])["uuid"]
+                backing = vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo(
+                    port=vim.dvs.PortConnection(portgroupKey=props["key"], switchUuid=switch_uuid))
+            else:
+                backing = vim.vm.device.VirtualEthernetCard.NetworkBackingInfo(network=net_obj, deviceName=net_name)
+            nic = vim.vm.device.VirtualVmxnet3(
+                backing=backing,
+                deviceInfo=vim.Description(label="Network Adapter 1", summary=net_name),
+                connectable=vim.vm.device.VirtualDevice.ConnectInfo(startConnected=True, allowGuestControl=True))
+            specs.append(vim.vm.device.VirtualDeviceSpec(operation=add, device=nic))
+        return specs
+
+    @requires_connection
     def clone_vm(self, template_name: str, new_name: str) -> str:
         """Clone a new virtual machine."""
-        self._connect_vcenter()
-        
-        template_vm = self.find_vm(template_name)
+        template_vm = self._find_vm(template_name)
         if not template_vm:
             raise Exception(f"Template {template_name} not found")
 
@@ -674,112 +1066,381 @@ class VMwareManager:
 
         task = template_vm.Clone(folder=self.datacenter_obj.vmFolder, name=new_name, spec=clone_spec)
         self._wait_for_task(task)
+        self._forget_vm(new_name)
         
         return f"VM '{new_name}' cloned from '{template_name}'."
 
+    @requires_connection
     def delete_vm(self, name: str) -> str:
         """Delete the specified virtual machine."""
-        self._connect_vcenter()
-        
         # This now works because find_vm does NOT disconnect the session
-        vm = self.find_vm(name)
+        vm = self._find_vm(name)
         if not vm:
             raise Exception(f"VM {name} not found")
             
         task = vm.Destroy_Task()
         self._wait_for_task(task)
+        self._forget_vm(name)
         
         return f"VM '{name}' deleted."
 
+    @requires_connection
     def power_on_vm(self, name: str) -> str:
         """Power on the specified virtual machine."""
-        self._connect_vcenter()
-        
-        vm = self.find_vm(name)
-        if not vm:
-            raise Exception(f"VM {name} not found")
-            
-        if vm.runtime.powerState == vim.VirtualMachine.PowerState.poweredOn:
+        data = self._get_vm_props(name)
+        if data.get("runtime.powerState") == vim.VirtualMachine.PowerState.poweredOn:
             return f"VM '{name}' is already powered on."
             
-        task = vm.PowerOnVM_Task()
+        task = data["obj"].PowerOnVM_Task()
         self._wait_for_task(task)
         
         return f"VM '{name}' powered on."
 
+    @requires_connection
     def power_off_vm(self, name: str) -> str:
         """Power off the specified virtual machine."""
-        self._connect_vcenter()
-        
-        vm = self.find_vm(name)
-        if not vm:
-            raise Exception(f"VM {name} not found")
-
-        if vm.runtime.powerState == vim.VirtualMachine.PowerState.poweredOff:
+        data = self._get_vm_props(name)
+        if data.get("runtime.powerState") == vim.VirtualMachine.PowerState.poweredOff:
             return f"VM '{name}' is already powered off."
             
-        task = vm.PowerOffVM_Task()
+        task = data["obj"].PowerOffVM_Task()
         self._wait_for_task(task)
         
         return f"VM '{name}' powered off."
 
     def _wait_for_task(self, task):
         """Helper to wait for task completion"""
-        while task.info.state in [vim.TaskInfo.State.running, vim.TaskInfo.State.queued]:
-            continue
+        try:
+            self._wait_for_task_updates(task)
+        except (vmodl.fault.NotSupported, vmodl.fault.MethodNotFound):
+            logging.debug("WaitForUpdatesEx unavailable, polling task %s", task._moId)
+            self._poll_task(task)
+
+    def _poll_task(self, task):
+        """Poll task.info.state with a growing delay: quick tasks return fast, long ones cost little."""
+        delay = self.config.poll_min
+        while task.info.state not in _TERMINAL_STATES:
+            time.sleep(delay)
+            delay = min(delay * self.config.poll_multiplier, self.config.poll_max)
         if task.info.state == vim.TaskInfo.State.error:
-            raise task.info.error
+            raise task.info.error or Exception(f"Task {task._moId} failed")
+
+    def _wait_for_task_updates(self, task):
+        # A private collector blocks in WaitForUpdatesEx until vCenter reports a state change,
+        # instead of fetching task.info over and over
+        collector = self.content.propertyCollector.CreatePropertyCollector()
+        try:
+            filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+                objectSet=[vmodl.query.PropertyCollector.ObjectSpec(obj=task, skip=False)],
+                propSet=[vmodl.query.PropertyCollector.PropertySpec(
+                    type=vim.Task, pathSet=["info.state", "info.error"], all=False)]
+            )
+            collector.CreateFilter(filter_spec, partialUpdates=True)
+            options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=30)
+            version, state, error = "", None, None
+            while state not in _TERMINAL_STATES:
+                update = collector.WaitForUpdatesEx(version, options)
+                if update is None:
+                    continue  # maxWaitSeconds passed without a change
+                version = update.version
+                for filter_update in update.filterSet:
+                    for object_update in filter_update.objectSet:
+                        for change in object_update.changeSet:
+                            if change.name == "info.state":
+                                state = change.val
+                            elif change.name == "info.error":
+                                error = change.val
+        finally:
+            collector.Destroy()
+        if state == vim.TaskInfo.State.error:
+            raise error or Exception(f"Task {task._moId} failed")
+
+
+# Mirror of per-VM quick stats, kept current by PropertyCollector push updates
+class VMStatsCache(threading.Thread):
+    PROPS = ["name", "summary.quickStats.overallCpuUsage", "summary.quickStats.guestMemoryUsage",
+             "summary.storage.committed"]
+    # Seconds to wait before re-subscribing after the update stream fails
+    RETRY_DELAY = 10
+
+    def __init__(self, config: Config):
+        super().__init__(name="vm-stats-cache", daemon=True)
+        # Own connection (and session, unless it is the first to claim the stored one):
+        # WaitForUpdatesEx holds a request open for up to a minute
+        self._mgr = VMwareManager(config)
+        self._lock = threading.Lock()
+        self._by_moid: Dict[str, Dict[str, Any]] = {}  # VM moId -> {"obj": VirtualMachine, property: value}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached properties of the named VM, or None if not (yet) known."""
+        with self._lock:
+            entry = self._by_name.get(name)
+            return dict(entry) if entry else None
+
+    def run(self):
+        while True:
+            try:
+                self._follow_updates()
+            except Exception as e:
+                logging.warning(f"VM stats cache lost its update stream, retrying: {e}")
+                with self._lock:
+                    self._by_moid.clear()
+                    self._by_name.clear()
+                time.sleep(self.RETRY_DELAY)
+
+    def _follow_updates(self):
+        mgr = self._mgr
+        mgr._ensure_alive()
+        collector = mgr.content.propertyCollector.CreatePropertyCollector()
+        view = mgr.content.viewManager.CreateContainerView(mgr.datacenter_obj, [vim.VirtualMachine], True)
+        try:
+            traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+                name="traverseView", path="view", skip=False, type=vim.view.ContainerView
+            )
+            filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+                objectSet=[vmodl.query.PropertyCollector.ObjectSpec(obj=view, skip=True, selectSet=[traversal_spec])],
+                propSet=[vmodl.query.PropertyCollector.PropertySpec(
+                    type=vim.VirtualMachine, pathSet=self.PROPS, all=False)]
+            )
+            collector.CreateFilter(filter_spec, partialUpdates=True)
+            options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=60)
+            version = ""
+            while True:
+                update = collector.WaitForUpdatesEx(version, options)
+                if update is None:
+                    continue  # maxWaitSeconds passed without a change
+                version = update.version
+                self._apply(update)
+        finally:
+            try:
+                collector.Destroy()
+                view.Destroy()
+            except Exception:
+                pass
+
+    def _apply(self, update):
+        with self._lock:
+            for filter_update in update.filterSet:
+                for object_update in filter_update.objectSet:
+                    moid = object_update.obj._moId
+                    if object_update.kind == "leave":
+                        entry = self._by_moid.pop(moid, None)
+                        if entry:
+                            self._by_name.pop(entry.get("name"), None)
+                        continue
+                    entry = self._by_moid.setdefault(moid, {"obj": object_update.obj})
+                    old_name = entry.get("name")
+                    for change in object_update.changeSet:
+                        if change.op in ("remove", "indirectRemove"):
+                            entry.pop(change.name, None)
+                        else:
+                            entry[change.name] = change.val
+                    if old_name != entry.get("name"):
+                        self._by_name.pop(old_name, None)
+                    if entry.get("name"):
+                        self._by_name[entry["name"]] = entry
+
+
+class PoolTimeout(Exception):
+    """No vCenter session became available within pool_timeout."""
+
+# Bounded pool of VMwareManager sessions, shared by all MCP sessions
+class ServiceInstancePool:
+    # Read-only operations whose results are shared for cache_ttl_seconds
+    CACHED_METHODS = frozenset({"list_vms", "list_vms_detailed", "bulk_perf", "get_vm_performance"})
+
+    def __init__(self, config: Config):
+        self.config = config
+        # LIFO so the most recently used (warm) sessions are reused and the rest can age out
+        self._idle: queue.LifoQueue = queue.LifoQueue()  # (VMwareManager, released_at)
+        self._lock = threading.Lock()
+        self._size = 0
+        self._housekeeper: Optional[threading.Thread] = None
+        self._read_cache = TTLCache(maxsize=1024, ttl=config.cache_ttl_seconds)  # (method, *args) -> result
+        self._cache_lock = threading.Lock()
+        # Bumped by every mutation; reads that overlapped one don't store their result
+        self._cache_generation = 0
+        # One worker per possible session: extra threads would only queue in _checkout, and the
+        # default executor is shared with everything else using asyncio.to_thread
+        self._executor = ThreadPoolExecutor(max_workers=config.max_connections, thread_name_prefix="vcenter")
+        # Counters reported by /health
+        self.checkouts = 0
+        self.timeouts = 0
+        self.evictions = 0
+
+    def _checkout(self) -> VMwareManager:
+        try:
+            mgr, released_at = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._size < self.config.max_connections:
+                    self._size += 1
+                    return VMwareManager(self.config)
+            try:
+                mgr, released_at = self._idle.get(timeout=self.config.pool_timeout)
+            except queue.Empty:
+                self.timeouts += 1
+                raise PoolTimeout(f"No vCenter connection available within {self.config.pool_timeout}s "
+                                  f"(max_connections={self.config.max_connections})")
+        return mgr
+
+    def _release(self, mgr: VMwareManager):
+        connected = sum(1 for m, _ in list(self._idle.queue) if m.si)
+        if mgr.si and connected >= self.config.max_keepalive_connections:
+            # Keep the slot but close its vCenter connection
+            mgr._reset_connection_state()
+            self.evictions += 1
+        self._idle.put((mgr, time.monotonic()))
+
+    def start(self):
+        """Start the housekeeping thread (opens pool_size sessions, then evicts idle ones)
+        and the push-updated VM stats cache."""
+        if self._housekeeper is None:
+            self._housekeeper = threading.Thread(target=self._housekeep, name="vcenter-pool-housekeeping", daemon=True)
+            self._housekeeper.start()
+            VMwareManager.stats_cache = VMStatsCache(self.config)
+            VMwareManager.stats_cache.start()
+
+    def _housekeep(self):
+        self._prewarm()
+        while True:
+            time.sleep(max(self.config.keepalive_expiry / 4, 1))
+            self._evict_idle()
+
+    def _prewarm(self):
+        """Connect pool_size sessions up front so the first requests skip the login."""
+        for _ in range(min(self.config.pool_size, self.config.max_connections)):
+            with self._lock:
+                if self._size >= self.config.max_connections:
+                    return
+                self._size += 1
+            mgr = VMwareManager(self.config)
+            try:
+                mgr._connect_vcenter()
+            except Exception as e:
+                # vCenter unreachable: leave the rest to connect on first use
+                logging.warning(f"Could not pre-connect vCenter session: {e}")
+                self._idle.put((mgr, time.monotonic()))
+                return
+            self._idle.put((mgr, time.monotonic()))
+
+    def _evict_idle(self):
+        """Close sessions idle longer than keepalive_expiry, keeping pool_size of them connected."""
+        # Take the idle entries out (newest first) so nobody checks one out mid-reset
+        entries = []
+        while True:
+            try:
+                entries.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        now = time.monotonic()
+        kept = 0
+        for mgr, released_at in entries:
+            if mgr.si and kept < self.config.pool_size:
+                kept += 1
+            elif mgr.si and now - released_at > self.config.keepalive_expiry:
+                mgr._reset_connection_state()
+                self.evictions += 1
+        for entry in reversed(entries):
+            self._idle.put(entry)
+
+    @contextmanager
+    def acquire(self):
+        """Check out a VMwareManager for the duration of the with-block."""
+        mgr = self._checkout()
+        self.checkouts += 1
+        try:
+            yield mgr
+        finally:
+            self._release(mgr)
+
+    def _run(self, method: str, *args):
+        if method not in self.CACHED_METHODS:
+            try:
+                with self.acquire() as mgr:
+                    return mgr._call(getattr(mgr, method), *args)
+            finally:
+                with self._cache_lock:
+                    # Mutations change the VM list and the state of the VMs they name,
+                    # which most cached entries (bulk listings included) reflect
+                    self._cache_generation += 1
+                    self._read_cache.clear()
+
+        key = (method, *args)
+        with self._cache_lock:
+            if key in self._read_cache:
+                return self._read_cache[key]
+            generation = self._cache_generation
+        with self.acquire() as mgr:
+            result = mgr._call(getattr(mgr, method), *args)
+        with self._cache_lock:
+            # A mutation that finished while this read ran may not be reflected in result
+            if generation == self._cache_generation:
+                self._read_cache[key] = result
+        return result
+
+    async def call(self, method: str, *args):
+        """Run a VMwareManager method on a pooled session.
+
+        pyVmomi is synchronous, so each call runs on the pool's executor and the event
+        loop keeps serving other MCP requests.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._run, method, *args)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": self._size, "idle": self._idle.qsize(), "checkouts": self.checkouts,
+                "timeouts": self.timeouts, "evictions": self.evictions}
+
 # ---------------- MCP Server Definition ----------------
 
-# Initialize MCP Server object
-mcp_server = Server(name="VMware-MCP-Server", version="0.0.1")
 # Define supported tools (executable operations) and resources (data interfaces)
 # The implementation of tools and resources will call methods in VMwareManager
 # Note: For each operation, perform API key authentication check, and only execute sensitive operations if the authenticated flag is True
 # If not authenticated, an exception is raised
 
 # Tool 1: Create virtual machine
-def tool_create_vm(name: str, cpu: int, memory: int, datastore: str = None, network: str = None) -> str:
+async def tool_create_vm(name: str, cpu: int, memory: int, datastore: str = None, network: str = None) -> str:
     """Create a new virtual machine."""
     # Authentication disabled for open access
     # fresh_manager = VMwareManager(config)
     # return fresh_manager.create_vm(name, cpu, memory, datastore, network)
-    return manager.create_vm(name, cpu, memory, datastore, network)
+    return await pool.call("create_vm", name, cpu, memory, datastore, network)
 
 # Tool 3: Clone virtual machine
-def tool_clone_vm(template_name: str, new_name: str) -> str:
+async def tool_clone_vm(template_name: str, new_name: str) -> str:
     """Clone a virtual machine from a template."""
     # Authentication disabled for open access
     # fresh_manager = VMwareManager(config)
-    return manager.clone_vm(template_name, new_name)
+    return await pool.call("clone_vm", template_name, new_name)
 
 # Tool 4: Delete virtual machine
-def tool_delete_vm(name: str) -> str:
+async def tool_delete_vm(name: str) -> str:
     """Delete the specified virtual machine."""
     # Authentication disabled for open access
     # fresh_manager = VMwareManager(config)
-    return manager.delete_vm(name)
+    return await pool.call("delete_vm", name)
 
 # Tool 5: Power on virtual machine
-def tool_power_on(name: str) -> str:
+async def tool_power_on(name: str) -> str:
     """Power on the specified virtual machine."""
     # Authentication disabled for open access
     # fresh_manager = VMwareManager(config)
-    return manager.power_on_vm(name)
+    return await pool.call("power_on_vm", name)
 
 # Tool 6: Power off virtual machine
-def tool_power_off(name: str) -> str:
+async def tool_power_off(name: str) -> str:
     """Power off the specified virtual machine."""
     # Authentication disabled for open access
     # fresh_manager = VMwareManager(config)
-    return manager.power_off_vm(name)
+    return await pool.call("power_off_vm", name)
 
 # Tool 7: List all virtual machines
-def tool_list_vms() -> list:
+async def tool_list_vms() -> list:
     """Return a list of all virtual machine names."""
     # Authentication disabled for open access
     # fresh_manager = VMwareManager(config)
-    return manager.list_vms()
+    return await pool.call("list_vms")
 # def tool_list_vms() -> list:
 #     """Return a list of all virtual machine names."""
 #     # Reset any stale state
@@ -793,12 +1454,41 @@ def tool_list_vms() -> list:
 #         if hasattr(manager, 'si') and manager.si:
 #             connect.Disconnect(manager.si)
 
+# Tool 8: List all virtual machines with power state and resource usage
+async def tool_list_vms_detailed() -> list:
+    """Return name, power state, CPU, memory and storage usage of every virtual machine."""
+    return await pool.call("list_vms_detailed")
+
+# Tool 9: Performance data for several virtual machines at once
+async def tool_bulk_perf(names: Optional[list] = None) -> dict:
+    """Return CPU, memory and storage usage keyed by VM name."""
+    # Tuple so the arguments can key the result cache
+    return await pool.call("bulk_perf", tuple(names or ()))
+
 
 # Resource 1: Retrieve virtual machine performance data
-def resource_vm_performance(vm_name: str) -> dict:
+async def resource_vm_performance(vm_name: str) -> dict:
     """Retrieve CPU, memory, storage, and network usage for the specified virtual machine."""
     # Authentication disabled for open access
-    return manager.get_vm_performance(vm_name)
+    return await pool.call("get_vm_performance", vm_name)
+
+def _specialize_handler(fn, input_schema: dict):
+    """Generate handler(params) for fn with each argument read from params at a fixed position.
+
+    Replaces fn(**params): no kwargs dict is rebuilt per call, and arguments the schema
+    marks as required are indexed directly (tools/call has already validated them).
+    """
+    required = set(input_schema.get("required", ()))
+    namespace = {"_fn": fn}
+    args = []
+    for param in inspect.signature(fn).parameters.values():
+        if param.name in required:
+            args.append(f"params[{param.name!r}]")
+        else:
+            namespace[f"_default_{param.name}"] = param.default
+            args.append(f"params.get({param.name!r}, _default_{param.name})")
+    exec(f"def {fn.__name__}_handler(params):\n    return _fn({', '.join(args)})", namespace)
+    return namespace[f"{fn.__name__}_handler"]
 
 # Register the above functions as tools and resources for the MCP Server
 # Encapsulate using mcp.types.Tool and mcp.types.Resource
@@ -807,15 +1497,15 @@ tools = {
         name="createVM",
         description="Create a new virtual machine",
         parameters={"name": str, "cpu": int, "memory": int, "datastore": Optional[str], "network": Optional[str]},
-        handler=lambda params: tool_create_vm(**params),
+        handler=tool_create_vm,
         inputSchema={
             "type": "object",
             "properties": {
                 "name": {"type": "string"},
                 "cpu": {"type": "integer"},
                 "memory": {"type": "integer"},
-                "datastore": {"type": "string", "nullable": True},
-                "network": {"type": "string", "nullable": True}
+                "datastore": {"type": ["string", "null"]},
+                "network": {"type": ["string", "null"]}
             },
             "required": ["name", "cpu", "memory"]
         }
@@ -824,7 +1514,7 @@ tools = {
         name="cloneVM",
         description="Clone a virtual machine from a template or existing VM",
         parameters={"template_name": str, "new_name": str},
-        handler=lambda params: tool_clone_vm(**params),
+        handler=tool_clone_vm,
         inputSchema={
             "type": "object",
             "properties": {
@@ -838,7 +1528,7 @@ tools = {
         name="deleteVM",
         description="Delete a virtual machine",
         parameters={"name": str},
-        handler=lambda params: tool_delete_vm(**params),
+        handler=tool_delete_vm,
         inputSchema={
             "type": "object",
             "properties": {"name": {"type": "string"}},
@@ -849,7 +1539,7 @@ tools = {
         name="powerOn",
         description="Power on a virtual machine",
         parameters={"name": str},
-        handler=lambda params: tool_power_on(**params),
+        handler=tool_power_on,
         inputSchema={
             "type": "object",
             "properties": {"name": {"type": "string"}},
@@ -860,7 +1550,7 @@ tools = {
         name="powerOff",
         description="Power off a virtual machine",
         parameters={"name": str},
-        handler=lambda params: tool_power_off(**params),
+        handler=tool_power_off,
         inputSchema={
             "type": "object",
             "properties": {"name": {"type": "string"}},
@@ -871,8 +1561,27 @@ tools = {
         name="listVMs",
         description="List all virtual machines",
         parameters={},
-        handler=lambda params: tool_list_vms(),
+        handler=tool_list_vms,
         inputSchema={"type": "object", "properties": {}}
+    ),
+    "listVMsDetailed": types.Tool(
+        name="listVMsDetailed",
+        description="List all virtual machines with power state and CPU, memory and storage usage",
+        parameters={},
+        handler=tool_list_vms_detailed,
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    "bulkPerf": types.Tool(
+        name="bulkPerf",
+        description="Get CPU, memory and storage usage for several virtual machines in one call",
+        parameters={"names": Optional[list]},
+        handler=tool_bulk_perf,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "names": {"type": "array", "items": {"type": "string"}}
+            }
+        }
     )
 }
 resources = {
@@ -891,25 +1600,67 @@ resources = {
         }
     )
 }
-
-# Add tools and resources to the MCP Server object
-for name, tool in tools.items():
-    setattr(mcp_server, f"tool_{name}", tool)
-for name, res in resources.items():
-    setattr(mcp_server, f"resource_{name}", res)
-
-# Set the MCP Server capabilities, declaring that the tools and resources list is available
-mcp_server.capabilities = {
-    "tools": {"listChanged": True},
-    "resources": {"listChanged": True}
-}
+for tool in tools.values():
+    tool.handler = _specialize_handler(tool.handler, tool.inputSchema)
+
+# Argument validators compiled once from each tool's inputSchema
+tool_validators = {name: fastjsonschema.compile(tool.inputSchema) for name, tool in tools.items()}
+
+# tools/list and resources/list payloads; the metadata never changes at runtime
+_TOOLS_LIST = [{"name": tool.name, "description": tool.description, "inputSchema": tool.inputSchema}
+               for tool in tools.values()]
+_RESOURCES_LIST = [{"uri": str(res.uri), "name": res.name, "description": res.description, "mimeType": "application/json"}
+                   for res in resources.values()]
+
+def _make_server() -> Server:
+    """Create an MCP Server object exposing the shared tools and resources."""
+    server = Server(name="VMware-MCP-Server", version="0.0.1")
+    # Add tools and resources to the MCP Server object
+    for name, tool in tools.items():
+        setattr(server, f"tool_{name}", tool)
+    for name, res in resources.items():
+        setattr(server, f"resource_{name}", res)
+
+    # Set the MCP Server capabilities, declaring that the tools and resources list is available
+    server.capabilities = {
+        "tools": {"listChanged": True},
+        "resources": {"listChanged": True}
+    }
+    return server
+
+# Default server for clients that don't use sessions
+mcp_server = _make_server()
+
+# One Server per MCP session (Mcp-Session-Id header) so concurrent clients don't share
+# request state; all of them call into the same VMwareManager. Sessions exist only for ids
+# minted on initialize, expire after SESSION_IDLE_SECONDS without a request, and the oldest
+# are evicted beyond MAX_SESSIONS.
+SESSION_IDLE_SECONDS = 1800
+MAX_SESSIONS = 1024
+_servers: TTLCache = TTLCache(maxsize=MAX_SESSIONS, ttl=SESSION_IDLE_SECONDS)
+
+def create_session() -> str:
+    """Start a session with its own Server and return its new id."""
+    session_id = uuid.uuid4().hex
+    _servers[session_id] = _make_server()
+    return session_id
+
+def get_server(session_id: str) -> Optional[Server]:
+    """Return the Server for a live session and restart its idle timer, or None if unknown or expired."""
+    server = _servers.get(session_id)
+    if server is not None:
+        _servers[session_id] = server
+    return server
 
 # Simple HTTP JSON-RPC handler for stateless MCP operations
-async def handle_mcp_request(request_data: dict) -> dict:
+async def handle_mcp_request(request_data: dict, server: Optional[Server] = None) -> dict:
     """Handle a single MCP JSON-RPC request and return response."""
+    if not isinstance(request_data, dict):
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}
+    server = server or mcp_server
     try:
         # Initialize server for this request
-        init_opts = mcp_server.create_initialization_options()
+        init_opts = server.create_initialization_options()
 
         # Process the request through MCP server
         # For stateless operation, we'll handle the message directly
@@ -924,7 +1675,7 @@ async def handle_mcp_request(request_data: dict) -> dict:
                 "id": request_id,
                 "result": {
                     "protocolVersion": "2024-11-05",
-                    "capabilities": mcp_server.capabilities,
+                    "capabilities": server.capabilities,
                     "serverInfo": {
                         "name": "VMware-MCP-Server",
                         "version": "0.0.1"
@@ -933,18 +1684,10 @@ async def handle_mcp_request(request_data: dict) -> dict:
             }
         elif method == "tools/list":
             # Return list of available tools
-            tool_list = []
-            for tool_name in tools.keys():
-                tool = tools[tool_name]
-                tool_list.append({
-                    "name": tool.name,
-                    "description": tool.description,
-                    "inputSchema": tool.inputSchema
-                })
             response = {
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {"tools": tool_list}
+                "result": {"tools": _TOOLS_LIST}
             }
         elif method == "tools/call":
             # Execute a tool
@@ -954,12 +1697,23 @@ async def handle_mcp_request(request_data: dict) -> dict:
             if tool_name in tools:
                 tool = tools[tool_name]
                 try:
-                    result = tool.handler(tool_args)
+                    # Reject malformed arguments before anything reaches vCenter
+                    tool_validators[tool_name](tool_args)
+                    result = await tool.handler(tool_args)
                     response = {
                         "jsonrpc": "2.0",
                         "id": request_id,
                         "result": result
                     }
+                except fastjsonschema.JsonSchemaException as e:
+                    response = {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "error": {
+                            "code": -32602,
+                            "message": f"Invalid params: {e.message}"
+                        }
+                    }
                 except Exception as e:
                     response = {
                         "jsonrpc": "2.0",
@@ -980,19 +1734,10 @@ async def handle_mcp_request(request_data: dict) -> dict:
                 }
         elif method == "resources/list":
             # Return list of available resources
-            resource_list = []
-            for res_name in resources.keys():
-                res = resources[res_name]
-                resource_list.append({
-                    "uri": res.uri,
-                    "name": res.name,
-                    "description": res.description,
-                    "mimeType": "application/json"
-                })
             response = {
                 "jsonrpc": "2.0",
                 "id": request_id,
-                "result": {"resources": resource_list}
+                "result": {"resources": _RESOURCES_LIST}
             }
         elif method == "resources/read":
             # Read a resource
@@ -1000,11 +1745,11 @@ async def handle_mcp_request(request_data: dict) -> dict:
             if uri and uri.startswith("vmstats://"):
                 vm_name = uri.replace("vmstats://", "")
                 try:
-                    result = resource_vm_performance(vm_name)
+                    result = await resource_vm_performance(vm_name)
                     response = {
                         "jsonrpc": "2.0",
                         "id": request_id,
-                        "result": {"contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(result)}]}
+                        "result": {"contents": [{"uri": uri, "mimeType": "application/json", "text": orjson.dumps(result).decode()}]}
                     }
                 except Exception as e:
                     response = {
@@ -1047,69 +1792,153 @@ async def handle_mcp_request(request_data: dict) -> dict:
             }
         }
 
-# Simple ASGI application routing: dispatch requests to stateless MCP operations
-async def app(scope, receive, send):
-    if scope["type"] == "http":
-        path = scope.get("path", "")
-        method = scope.get("method", "").upper()
-
-        if path == "/" and method == "GET":
-            # Root endpoint - basic server info for health checks
-            server_info = {
-                "name": "ESXi MCP Server",
-                "version": "0.0.1",
-                "status": "running",
-                "endpoints": {
-                    "mcp": "/mcp"
-                }
-            }
-            await send({"type": "http.response.start", "status": 200,
-                        "headers": [(b"content-type", b"application/json")]})
-            await send({"type": "http.response.body", "body": json.dumps(server_info).encode()})
-
-        elif path == "/mcp" and method == "POST":
-            # MCP JSON-RPC endpoint - handle stateless MCP requests
-            # Read the request body
-            body = b""
-            while True:
-                message = await receive()
-                body += message.get("body", b"")
-                if not message.get("more_body", False):
-                    break
+# ASGI routes: each handler takes (scope, receive, send) and writes the full response
+
+_JSON_HEADERS = [(b"content-type", b"application/json")]
+# Root endpoint - basic server info for health checks
+_SERVER_INFO_BODY = orjson.dumps({
+    "name": "ESXi MCP Server",
+    "version": "0.0.1",
+    "status": "running",
+    "endpoints": {
+        "mcp": "/mcp",
+        "health": "/health"
+    }
+})
+_CORS_HEADERS = [
+    (b"access-control-allow-methods", b"POST, DELETE, OPTIONS"),
+    (b"access-control-allow-headers", b"Content-Type, Mcp-Session-Id"),
+    (b"access-control-allow-origin", b"*")
+]
+_PARSE_ERROR_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "error": {"code": -32700, "message": "Parse error"},
+    "id": None
+})
+_SESSION_NOT_FOUND_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "error": {"code": -32001, "message": "Session not found"},
+    "id": None
+})
+_TOO_LARGE_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "error": {"code": -32600, "message": "Request body too large"},
+    "id": None
+})
+
+async def _handle_root(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": _JSON_HEADERS})
+    await send({"type": "http.response.body", "body": _SERVER_INFO_BODY})
+
+async def _handle_health(scope, receive, send):
+    health = {"status": "ok", "sessions": len(_servers), "servers": len(_servers) + 1,
+              "pool": pool.stats()}
+    await send({"type": "http.response.start", "status": 200, "headers": _JSON_HEADERS})
+    await send({"type": "http.response.body", "body": orjson.dumps(health)})
+
+def _is_notification(request_data) -> bool:
+    """True for a well-formed JSON-RPC request without an "id" member, which must not be answered."""
+    return isinstance(request_data, dict) and isinstance(request_data.get("method"), str) and "id" not in request_data
+
+async def _handle_mcp_post(scope, receive, send):
+    # MCP JSON-RPC endpoint - handle stateless MCP requests
+    request_headers = dict(scope.get("headers", []))
+    max_body = config.max_body_bytes
+    # Refuse a declared oversized body before reading any of it
+    try:
+        too_large = int(request_headers.get(b"content-length", b"0")) > max_body
+    except ValueError:
+        too_large = False
+    # Read the request body
+    body = bytearray()  # Extended in place; bytes += bytes would copy on every chunk
+    while not too_large:
+        message = await receive()
+        body.extend(message.get("body", b""))
+        # Chunked uploads carry no Content-Length, so enforce the cap while streaming too
+        too_large = len(body) > max_body
+        if not message.get("more_body", False):
+            break
+    if too_large:
+        await send({"type": "http.response.start", "status": 413, "headers": _JSON_HEADERS})
+        await send({"type": "http.response.body", "body": _TOO_LARGE_BODY})
+        return
 
-            try:
-                request_data = json.loads(body.decode())
-                response_data = await handle_mcp_request(request_data)
+    try:
+        request_data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        await send({"type": "http.response.start", "status": 400, "headers": _JSON_HEADERS})
+        await send({"type": "http.response.body", "body": _PARSE_ERROR_BODY})
+        return
 
-                await send({"type": "http.response.start", "status": 200,
-                           "headers": [(b"content-type", b"application/json")]})
-                await send({"type": "http.response.body", "body": json.dumps(response_data).encode()})
+    # A JSON-RPC batch is an array of requests, answered with an array of responses
+    batch = request_data if isinstance(request_data, list) else [request_data]
+    session_id = request_headers.get(b"mcp-session-id", b"").decode()
+    if session_id:
+        server = get_server(session_id)
+        if server is None:
+            # Unknown or expired session; the client must initialize a new one
+            await send({"type": "http.response.start", "status": 404, "headers": _JSON_HEADERS})
+            await send({"type": "http.response.body", "body": _SESSION_NOT_FOUND_BODY})
+            return
+    elif any(isinstance(r, dict) and r.get("method") == "initialize" for r in batch):
+        # Start a new session; the client echoes the id on subsequent requests
+        session_id = create_session()
+        server = _servers[session_id]
+    else:
+        server = mcp_server
+    # Requests in a batch run concurrently; each tool call executes on its own pooled session
+    responses = await asyncio.gather(*[handle_mcp_request(r, server) for r in batch])
+    # Notifications (valid requests without an "id" member) get no response
+    responses = [response for r, response in zip(batch, responses) if not _is_notification(r)]
+    if not batch:
+        response_data = {"jsonrpc": "2.0", "id": None,
+                         "error": {"code": -32600, "message": "Invalid Request"}}
+    elif not responses:
+        response_data = None
+    elif not isinstance(request_data, list):
+        response_data = responses[0]
+    else:
+        response_data = responses
 
-            except json.JSONDecodeError:
-                await send({"type": "http.response.start", "status": 400,
-                           "headers": [(b"content-type", b"application/json")]})
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32700, "message": "Parse error"},
-                    "id": None
-                }
-                await send({"type": "http.response.body", "body": json.dumps(error_response).encode()})
-
-        elif path == "/mcp" and method == "OPTIONS":
-            # CORS preflight request
-            headers = [
-                (b"access-control-allow-methods", b"POST, OPTIONS"),
-                (b"access-control-allow-headers", b"Content-Type"),
-                (b"access-control-allow-origin", b"*")
-            ]
-            await send({"type": "http.response.start", "status": 204, "headers": headers})
-            await send({"type": "http.response.body", "body": b""})
+    session_headers = [(b"mcp-session-id", session_id.encode())] if session_id else []
+    if response_data is None:
+        # Only notifications: nothing to answer
+        await send({"type": "http.response.start", "status": 204, "headers": session_headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": _JSON_HEADERS + session_headers})
+    await send({"type": "http.response.body", "body": orjson.dumps(response_data)})
+
+async def _handle_mcp_delete(scope, receive, send):
+    # Client ends its session
+    session_id = dict(scope.get("headers", [])).get(b"mcp-session-id", b"").decode()
+    _servers.pop(session_id, None)
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+async def _handle_cors(scope, receive, send):
+    # CORS preflight request
+    await send({"type": "http.response.start", "status": 204, "headers": _CORS_HEADERS})
+    await send({"type": "http.response.body", "body": b""})
+
+async def _handle_not_found(scope, receive, send):
+    await send({"type": "http.response.start", "status": 404,
+                "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"Not Found"})
+
+_ROUTES = {
+    ("/", "GET"): _handle_root,
+    ("/health", "GET"): _handle_health,
+    ("/mcp", "POST"): _handle_mcp_post,
+    ("/mcp", "DELETE"): _handle_mcp_delete,
+    ("/mcp", "OPTIONS"): _handle_cors,
+}
 
-        else:
-            # Route not found
-            await send({"type": "http.response.start", "status": 404,
-                        "headers": [(b"content-type", b"text/plain")]})
-            await send({"type": "http.response.body", "body": b"Not Found"})
+# Simple ASGI application routing: dispatch requests to stateless MCP operations
+async def app(scope, receive, send):
+    if scope["type"] == "http":
+        handler = _ROUTES.get((scope.get("path", ""), scope.get("method", "").upper()), _handle_not_found)
+        await handler(scope, receive, send)
     else:
         # Non-HTTP event, do not process
         return
@@ -1144,9 +1973,20 @@ env_map = {
     "VCENTER_DATASTORE": "datastore",
     "VCENTER_NETWORK": "network",
     "VCENTER_INSECURE": "insecure",
+    "VCENTER_SERVER_PEM_CERT": "server_pem_cert",
     "MCP_LOG_FILE": "log_file",
     "MCP_LOG_LEVEL": "log_level",
-    "MCP_PORT": "port"
+    "MCP_PORT": "port",
+    "VCENTER_MAX_CONNECTIONS": "max_connections",
+    "VCENTER_MAX_KEEPALIVE_CONNECTIONS": "max_keepalive_connections",
+    "VCENTER_KEEPALIVE_EXPIRY": "keepalive_expiry",
+    "VCENTER_POOL_TIMEOUT": "pool_timeout",
+    "MCP_CACHE_TTL_SECONDS": "cache_ttl_seconds",
+    "VCENTER_POOL_SIZE": "pool_size",
+    "VCENTER_POLL_MIN": "poll_min",
+    "VCENTER_POLL_MAX": "poll_max",
+    "VCENTER_POLL_MULTIPLIER": "poll_multiplier",
+    "MCP_MAX_BODY_BYTES": "max_body_bytes"
 }
 for env_key, cfg_key in env_map.items():
     if env_key in os.environ and os.environ[env_key] != "":
@@ -1154,8 +1994,12 @@ for env_key, cfg_key in env_map.items():
         # Type conversion based on field type
         if cfg_key == "insecure":
             config_data[cfg_key] = val.lower() in ("1", "true", "yes")
-        elif cfg_key == "port":
+        elif cfg_key in ("port", "max_connections", "max_keepalive_connections", "pool_size",
+                         "max_body_bytes"):
             config_data[cfg_key] = int(val)
+        elif cfg_key in ("keepalive_expiry", "pool_timeout", "cache_ttl_seconds",
+                         "poll_min", "poll_max", "poll_multiplier"):
+            config_data[cfg_key] = float(val)
         else:
             config_data[cfg_key] = val
 
@@ -1176,11 +2020,12 @@ if not config.log_file:
     logging.getLogger().addHandler(logging.StreamHandler())
 
 logging.info("Starting VMware ESXi Management MCP Server...")
-# Create VMware Manager instance and connect
-manager = VMwareManager(config)
+# Create the pool of VMware Manager sessions; each connects on first use
+pool = ServiceInstancePool(config)
 
 # Start ASGI server to listen for MCP SSE connections
 if __name__ == "__main__":
     # Start ASGI application using the built-in uvicorn server
     import uvicorn
+    pool.start()
     uvicorn.run(app, host="0.0.0.0", port=config.port)
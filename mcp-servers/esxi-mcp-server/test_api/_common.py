@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shared configuration, vCenter/ESXi connection and helpers for the test_api scripts.
+The first get_si() call logs in; later calls (from any script in the same
+interpreter) reuse that session until the process exits.
+"""
+import ssl
+import atexit
+import functools
+from pathlib import Path
+import yaml
+from pyVim import connect
+from pyVmomi import vim, vmodl
+
+# The server's config.yaml, one directory up
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
+
+@functools.cache
+def load_config():
+    """Read config.yaml once per process."""
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+CONFIG = load_config()
+
+def _tune(context):
+    # TLS 1.2+ with ECDHE/AES-GCM suites only (TLS 1.3 suites are unaffected by set_ciphers)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.set_ciphers("ECDHE+AESGCM")
+    context.set_alpn_protocols(["http/1.1"])
+    return context
+
+# One context per verification mode shared by every script and connection, so OpenSSL
+# can resume TLS sessions instead of running full handshakes
+_INSECURE_CONTEXT = _tune(ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT))
+_INSECURE_CONTEXT.check_hostname = False  # Disable hostname checking
+_INSECURE_CONTEXT.verify_mode = ssl.CERT_NONE
+_VERIFIED_CONTEXT = _tune(ssl.create_default_context())
+
+def _logout(si, soap_stub):
+    try:
+        si.RetrieveContent().sessionManager.Logout()
+    except Exception:
+        pass
+    soap_stub.DropConnections()
+
+@functools.cache
+def get_si():
+    """Return the logged-in ServiceInstance for CONFIG, connecting on first use."""
+    # Up to 4 keep-alive HTTPS connections reused for every SOAP call
+    soap_stub = connect.SmartStubAdapter(
+        host=CONFIG["vcenter_host"],
+        sslContext=_INSECURE_CONTEXT if CONFIG.get("insecure") else _VERIFIED_CONTEXT,
+        poolSize=4,
+        connectionPoolTimeout=900)
+    # Logs in on first use and again if the session expires
+    login = connect.VimSessionOrientedStub.makeUserLoginMethod(CONFIG["vcenter_user"], CONFIG["vcenter_password"])
+    si = vim.ServiceInstance("ServiceInstance", connect.VimSessionOrientedStub(soap_stub, login))
+    atexit.register(_logout, si, soap_stub)
+    return si
+
+@functools.cache
+def get_content():
+    """ServiceContent of the shared session."""
+    return get_si().RetrieveContent()
+
+def get_vms_by_name():
+    """Map VM name -> VirtualMachine with one PropertyCollector call instead of a name read per VM."""
+    content = get_content()
+    pc = vmodl.query.PropertyCollector
+    view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
+    try:
+        spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=view, skip=True, selectSet=[
+                pc.TraversalSpec(name="traverseView", path="view", type=vim.view.ContainerView)])],
+            propSet=[pc.PropertySpec(type=vim.VirtualMachine, pathSet=["name"])])
+        return {obj.propSet[0].val: obj.obj for obj in content.propertyCollector.RetrieveContents([spec])}
+    finally:
+        view.Destroy()
+
+def get_vm_names():
+    """Names of all VMs, fetched in one call."""
+    return list(get_vms_by_name())
+
+def wait_for_tasks(tasks):
+    """Block until every task finishes, with one filter for all of them; returns {task: error or None}."""
+    pc = vmodl.query.PropertyCollector
+    collector = get_content().propertyCollector
+    spec = pc.FilterSpec(
+        objectSet=[pc.ObjectSpec(obj=task) for task in tasks],
+        propSet=[pc.PropertySpec(type=vim.Task, pathSet=["info.state", "info.error"])])
+    task_filter = collector.CreateFilter(spec, True)
+    done = (vim.TaskInfo.State.success, vim.TaskInfo.State.error)
+    states, errors = {}, {}
+    try:
+        version = ""
+        while len(tasks) > sum(state in done for state in states.values()):
+            update = collector.WaitForUpdatesEx(version, pc.WaitOptions(maxWaitSeconds=30))
+            if update is None:
+                continue  # No change within maxWaitSeconds
+            version = update.version
+            for filter_update in update.filterSet:
+                for object_update in filter_update.objectSet:
+                    for change in object_update.changeSet:
+                        if change.name == "info.state":
+                            states[object_update.obj] = change.val
+                        elif change.name == "info.error":
+                            errors[object_update.obj] = change.val
+    finally:
+        task_filter.Destroy()
+    return {task: errors.get(task) if states[task] == vim.TaskInfo.State.error else None for task in tasks}
+
+def wait_for_task_chain(task, then=None):
+    """Wait for task; if then(result) returns a follow-up task, wait for that one as well.
+
+    then is called once, with the first task's result, so at most one follow-up runs. Both
+    tasks are watched from one property collector session, so the follow-up is submitted as
+    soon as vCenter pushes the first task's completion. Returns the last task's result.
+    """
+    pc = vmodl.query.PropertyCollector
+    collector = get_content().propertyCollector
+    filters = []
+    try:
+        version = ""
+        while task is not None:
+            filters.append(collector.CreateFilter(pc.FilterSpec(
+                objectSet=[pc.ObjectSpec(obj=task)],
+                propSet=[pc.PropertySpec(type=vim.Task, pathSet=["info.state", "info.error", "info.result"])]), True))
+            info = {}
+            while info.get("info.state") not in (vim.TaskInfo.State.success, vim.TaskInfo.State.error):
+                update = collector.WaitForUpdatesEx(version, pc.WaitOptions(maxWaitSeconds=30))
+                if update is None:
+                    continue  # No change within maxWaitSeconds
+                version = update.version
+                for filter_update in update.filterSet:
+                    for object_update in filter_update.objectSet:
+                        if object_update.obj == task:
+                            info.update((change.name, change.val) for change in object_update.changeSet)
+            if info["info.state"] == vim.TaskInfo.State.error:
+                error = info.get("info.error")
+                raise error if error is not None else Exception(f"Task {task} failed without reporting an error")
+            result = info.get("info.result")
+            task = then(result) if then else None
+            then = None
+        return result
+    finally:
+        for task_filter in filters:
+            task_filter.Destroy()
+
+def wait_for_task(task):
+    """Block until task finishes; vCenter pushes the state change instead of being polled."""
+    return wait_for_task_chain(task)
@@ -3,16 +3,129 @@
 Comprehensive test script for VMware MCP Server
 Tests all available tools and APIs
 """
-import json
+import io
+import sys
 import time
+import queue
+import threading
+import asyncio
+import httpx
+import ijson
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Request bodies are serialized with orjson, so the content type is set explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+# VM lists are repetitive JSON and compress well; both clients decode transparently
+COMPRESSION_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+# Request envelopes with only the varying fields filled in per call
+RPC_TEMPLATE = b'{"jsonrpc":"2.0","id":%d,"method":"tools/call","params":{"name":%s,"arguments":%s}}'
+READ_TEMPLATE = b'{"jsonrpc":"2.0","id":%d,"method":"resources/read","params":{"uri":%s}}'
+
+def rpc(id_, name, arguments):
+    """Serialized tools/call request."""
+    return RPC_TEMPLATE % (id_, orjson.dumps(name), orjson.dumps(arguments))
+
+def read_resource(id_, uri):
+    """Serialized resources/read request."""
+    return READ_TEMPLATE % (id_, orjson.dumps(uri))
+
+# Status lines are collected here and written to stdout in one go when the run ends,
+# so terminal/CI output doesn't block the timed steps
+_output = io.StringIO()
+
+def log(message):
+    _output.write(f"{message}\n")
+
+def flush_log():
+    sys.stdout.write(_output.getvalue())
+    sys.stdout.flush()
+    _output.seek(0)
+    _output.truncate()
+
+# Phrases in a tool's result message that mean the call did what was asked
+EXPECT = {
+    "createVM": ("created",),
+    "cloneVM": ("cloned",),
+    "deleteVM": ("deleted",),
+    "powerOn": ("powered on", "already"),
+    "powerOff": ("powered off", "already"),
+}
+
+def succeeded(tool, response_data):
+    """True if a JSON-RPC response carries a result message matching EXPECT[tool]."""
+    message = response_data.get("result") if response_data else None
+    if not isinstance(message, str):
+        return False
+    message = message.lower()
+    return any(phrase in message for phrase in EXPECT[tool])
+
+def _rjson(response):
+    """Decode a JSON response straight from its bytes with orjson."""
+    return orjson.loads(response.content)
+
+try:
+    _ijson = ijson.get_backend("yajl2_c")  # C parser when the wheel ships it
+except ImportError:
+    _ijson = ijson
+
+def _scan_vm_list(response, wanted=(), head=0):
+    """Stream a listVMs response (requested with stream=True) without building the name list.
+
+    Returns (count, names from wanted that were seen, first head names), or None when the
+    response carries no result array.
+    """
+    response.raw.decode_content = True  # The session asks for gzip
+    has_result, count, found, first = False, 0, set(), []
+    for prefix, event, value in _ijson.parse(response.raw):
+        if prefix == "result" and event == "start_array":
+            has_result = True
+        elif prefix == "result.item" and event == "string":
+            count += 1
+            if value in wanted:
+                found.add(value)
+            if len(first) < head:
+                first.append(value)
+    return (count, found, first) if has_result else None
+
+def wait_until(predicate, timeout=10, initial=0.1):
+    """Poll predicate with a growing delay (capped at 1s) until it holds or timeout elapses."""
+    start = time.monotonic()
+    delay = initial
+    while time.monotonic() - start < timeout:
+        if predicate():
+            return True
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
+    return False
+
+def _read_sse(response, events):
+    """Keep the SSE socket drained; when nobody consumes events, the oldest are dropped."""
+    try:
+        for line in response.iter_lines(chunk_size=4096):
+            if not line:
+                continue
+            while True:
+                try:
+                    events.put_nowait(line)
+                    break
+                except queue.Full:
+                    try:
+                        events.get_nowait()
+                    except queue.Empty:
+                        pass
+    except requests.RequestException:
+        pass  # Stream closed when the test ends
 
 def test_mcp_tools():
     """Test all MCP server tools and APIs"""
     base_url = "http://localhost:8090"
 
-    print(" COMPREHENSIVE VMWARE MCP SERVER TEST")
-    print("=" * 60)
+    log(" COMPREHENSIVE VMWARE MCP SERVER TEST")
+    log("=" * 60)
 
     # Test data
     test_vm_name = "mcp-comprehensive-test"
@@ -20,323 +133,394 @@ def test_mcp_tools():
 
     # Use a single session for all requests (important for MCP)
     session = requests.Session()
+    # Keep one persistent connection to the server; retry transient gateway errors.
+    # Retry's default allowed_methods leaves POST out, so tool calls are never replayed.
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                          max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]))
+    session.mount("http://", adapter)
+    session.headers.update({**JSON_HEADERS, **COMPRESSION_HEADERS, "Connection": "keep-alive"})
+
+    # Readiness probes used instead of fixed sleeps (request id 0 is reserved for them)
+    def vm_listed(name):
+        response = session.post(f"{base_url}/sse/messages", data=rpc(0, "listVMs", {}), timeout=10, stream=True)
+        scan = _scan_vm_list(response, wanted={name}) if response.status_code == 200 else None
+        return bool(scan and scan[1])
+
+    def vm_using_cpu(name):
+        response = session.post(f"{base_url}/sse/messages", data=read_resource(0, f"vmstats://{name}"), timeout=10)
+        result = _rjson(response).get("result") if response.status_code == 200 else None
+        if not result or not result.get("contents"):
+            return False
+        return bool(orjson.loads(result["contents"][0]["text"]).get("cpu_usage_mhz"))
 
     try:
         # Step 1: Establish SSE connection (required for MCP protocol)
-        print("\n1. Establishing SSE Connection...")
+        log("\n1. Establishing SSE Connection...")
         try:
-            # Start SSE connection but don't read it fully - just establish the session
-            response = session.get(f"{base_url}/sse", stream=True, timeout=5)
+            # Open the SSE stream and consume it in the background for the whole run
+            response = session.get(f"{base_url}/sse", stream=True, timeout=(5, None))
             if response.status_code == 200:
-                print(" SSE connection established")
+                sse_events = queue.Queue(maxsize=64)
+                threading.Thread(target=_read_sse, args=(response, sse_events), daemon=True).start()
+                log(" SSE connection established")
             else:
-                print(f" SSE connection failed: {response.status_code}")
+                log(f" SSE connection failed: {response.status_code}")
                 return False
         except Exception as e:
-            print(f" SSE connection error: {e}")
+            log(f" SSE connection error: {e}")
             return False
 
-        # Give SSE a moment to establish
-        time.sleep(1)
+        # The session is usable once the server has sent its first event
+        try:
+            sse_events.get(timeout=5)
+        except queue.Empty:
+            log(" SSE stream sent no events")
+            return False
 
         # Step 2: Test listVMs tool
-        print("\n2. Testing listVMs tool...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": "listVMs",
-                "arguments": {}
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=10)
+        log("\n2. Testing listVMs tool...")
+        payload = rpc(1, "listVMs", {})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=10, stream=True)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result:
-                vm_list = result["result"]
-                print(f" listVMs successful: Found {len(vm_list)} VMs")
-                print(f"   VMs: {', '.join(vm_list[:5])}{'...' if len(vm_list) > 5 else ''}")
-                initial_vm_count = len(vm_list)
+            scan = _scan_vm_list(response, head=6)
+            if scan:
+                initial_vm_count, _, vm_list = scan  # Only the first few names are kept
+                log(f" listVMs successful: Found {initial_vm_count} VMs")
+                log(f"   VMs: {', '.join(vm_list[:5])}{'...' if initial_vm_count > 5 else ''}")
             else:
-                print(f" listVMs failed: {result}")
+                log(" listVMs failed: no result in response")
                 return False
         else:
-            print(f" listVMs HTTP error: {response.status_code} - {response.text}")
+            log(f" listVMs HTTP error: {response.status_code} - {response.text}")
             return False
 
         # Step 3: Test createVM tool
-        print(f"\n3. Testing createVM tool (creating '{test_vm_name}')...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/call",
-            "params": {
-                "name": "createVM",
-                "arguments": {
-                    "name": test_vm_name,
-                    "cpu": 1,
-                    "memory": 512
-                }
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=30)
+        log(f"\n3. Testing createVM tool (creating '{test_vm_name}')...")
+        payload = rpc(2, "createVM", {"name": test_vm_name, "cpu": 1, "memory": 512})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=30)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result and "created" in result["result"].lower():
-                print(f" createVM successful: {result['result']}")
+            result = _rjson(response)
+            if succeeded("createVM", result):
+                log(f" createVM successful: {result['result']}")
             else:
-                print(f" createVM failed: {result}")
+                log(f" createVM failed: {result}")
                 return False
         else:
-            print(f" createVM HTTP error: {response.status_code}")
+            log(f" createVM HTTP error: {response.status_code}")
             return False
 
-        # Wait a moment for VM creation to complete
-        time.sleep(2)
+        # Wait until the new VM shows up in the inventory
+        wait_until(lambda: vm_listed(test_vm_name))
 
         # Step 4: Verify VM was created (listVMs again)
-        print("\n4. Verifying VM creation...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 3,
-            "method": "tools/call",
-            "params": {
-                "name": "listVMs",
-                "arguments": {}
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=10)
+        log("\n4. Verifying VM creation...")
+        payload = rpc(3, "listVMs", {})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=10, stream=True)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result:
-                vm_list = result["result"]
-                if test_vm_name in vm_list:
-                    print(f" VM '{test_vm_name}' found in list ({len(vm_list)} total VMs)")
+            scan = _scan_vm_list(response, wanted={test_vm_name})
+            if scan:
+                vm_count, found, _ = scan
+                if found:
+                    log(f" VM '{test_vm_name}' found in list ({vm_count} total VMs)")
                 else:
-                    print(f" VM '{test_vm_name}' not found in list")
+                    log(f" VM '{test_vm_name}' not found in list")
                     return False
             else:
-                print(f" Verification failed: {result}")
+                log(" Verification failed: no result in response")
                 return False
 
         # Step 5: Test vmStats resource (performance monitoring)
-        print(f"\n5. Testing vmStats resource (performance for '{test_vm_name}')...")
+        log(f"\n5. Testing vmStats resource (performance for '{test_vm_name}')...")
         # Note: This uses a different URL pattern for resources
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 4,
-            "method": "resources/read",
-            "params": {
-                "uri": f"vmstats://{test_vm_name}"
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=10)
+        payload = read_resource(4, f"vmstats://{test_vm_name}")
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=10)
         if response.status_code == 200:
-            result = response.json()
+            result = _rjson(response)
             if "result" in result and "contents" in result["result"]:
                 stats = result["result"]["contents"][0]["text"]
-                stats_dict = json.loads(stats)
-                print(" vmStats successful:")
-                print(f"   CPU: {stats_dict.get('cpu_usage_mhz', 'N/A')} MHz")
-                print(f"   Memory: {stats_dict.get('memory_usage_mb', 'N/A')} MB")
-                print(f"   Storage: {stats_dict.get('storage_usage_gb', 'N/A')} GB")
+                stats_dict = orjson.loads(stats)
+                log(" vmStats successful:")
+                log(f"   CPU: {stats_dict.get('cpu_usage_mhz', 'N/A')} MHz")
+                log(f"   Memory: {stats_dict.get('memory_usage_mb', 'N/A')} MB")
+                log(f"   Storage: {stats_dict.get('storage_usage_gb', 'N/A')} GB")
             else:
-                print(f" vmStats failed: {result}")
+                log(f" vmStats failed: {result}")
         else:
-            print(f" vmStats HTTP error: {response.status_code}")
+            log(f" vmStats HTTP error: {response.status_code}")
 
         # Step 6: Test powerOn tool
-        print(f"\n6. Testing powerOn tool for '{test_vm_name}'...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 5,
-            "method": "tools/call",
-            "params": {
-                "name": "powerOn",
-                "arguments": {
-                    "name": test_vm_name
-                }
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=30)
+        log(f"\n6. Testing powerOn tool for '{test_vm_name}'...")
+        payload = rpc(5, "powerOn", {"name": test_vm_name})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=30)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result and ("powered on" in result["result"].lower() or "already" in result["result"].lower()):
-                print(f" powerOn successful: {result['result']}")
+            result = _rjson(response)
+            if succeeded("powerOn", result):
+                log(f" powerOn successful: {result['result']}")
             else:
-                print(f"️  powerOn result: {result}")
+                log(f"️  powerOn result: {result}")
         else:
-            print(f" powerOn HTTP error: {response.status_code}")
+            log(f" powerOn HTTP error: {response.status_code}")
 
-        # Wait for power on operation
-        time.sleep(3)
+        # Wait until the powered-on VM reports CPU usage
+        wait_until(lambda: vm_using_cpu(test_vm_name))
 
         # Step 7: Test powerOff tool
-        print(f"\n7. Testing powerOff tool for '{test_vm_name}'...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 6,
-            "method": "tools/call",
-            "params": {
-                "name": "powerOff",
-                "arguments": {
-                    "name": test_vm_name
-                }
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=30)
+        log(f"\n7. Testing powerOff tool for '{test_vm_name}'...")
+        payload = rpc(6, "powerOff", {"name": test_vm_name})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=30)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result and ("powered off" in result["result"].lower() or "already" in result["result"].lower()):
-                print(f" powerOff successful: {result['result']}")
+            result = _rjson(response)
+            if succeeded("powerOff", result):
+                log(f" powerOff successful: {result['result']}")
             else:
-                print(f"️  powerOff result: {result}")
+                log(f"️  powerOff result: {result}")
         else:
-            print(f" powerOff HTTP error: {response.status_code}")
+            log(f" powerOff HTTP error: {response.status_code}")
 
         # Step 8: Test cloneVM tool (if there's a VM to clone from)
         # Find an existing VM to clone from (skip test VM we just created)
         existing_vms = [vm for vm in vm_list if vm != test_vm_name]
         if existing_vms:
             source_vm = existing_vms[0]  # Use first available VM
-            print(f"\n8. Testing cloneVM tool (cloning '{source_vm}' to '{clone_vm_name}')...")
-
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 7,
-                "method": "tools/call",
-                "params": {
-                    "name": "cloneVM",
-                    "arguments": {
-                        "template_name": source_vm,
-                        "new_name": clone_vm_name
-                    }
-                }
-            }
-
-            response = session.post(f"{base_url}/sse/messages", json=payload, timeout=60)
+            log(f"\n8. Testing cloneVM tool (cloning '{source_vm}' to '{clone_vm_name}')...")
+
+            payload = rpc(7, "cloneVM", {"template_name": source_vm, "new_name": clone_vm_name})
+
+            response = session.post(f"{base_url}/sse/messages", data=payload, timeout=60)
             if response.status_code == 200:
-                result = response.json()
-                if "result" in result and "cloned" in result["result"].lower():
-                    print(f" cloneVM successful: {result['result']}")
+                result = _rjson(response)
+                if succeeded("cloneVM", result):
+                    log(f" cloneVM successful: {result['result']}")
                     cloned_created = True
                 else:
-                    print(f" cloneVM failed: {result}")
+                    log(f" cloneVM failed: {result}")
                     cloned_created = False
             else:
-                print(f" cloneVM HTTP error: {response.status_code}")
+                log(f" cloneVM HTTP error: {response.status_code}")
                 cloned_created = False
         else:
-            print("\n8. Skipping cloneVM test (no source VMs available)")
+            log("\n8. Skipping cloneVM test (no source VMs available)")
             cloned_created = False
 
         # Step 9: Clean up - delete test VMs
-        print(f"\n9. Cleaning up - deleting test VMs...")
+        log(f"\n9. Cleaning up - deleting test VMs...")
 
         # Delete cloned VM first (if it was created)
         if cloned_created:
-            print(f"   Deleting cloned VM '{clone_vm_name}'...")
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 8,
-                "method": "tools/call",
-                "params": {
-                    "name": "deleteVM",
-                    "arguments": {
-                        "name": clone_vm_name
-                    }
-                }
-            }
-
-            response = session.post(f"{base_url}/sse/messages", json=payload, timeout=30)
+            log(f"   Deleting cloned VM '{clone_vm_name}'...")
+            payload = rpc(8, "deleteVM", {"name": clone_vm_name})
+
+            response = session.post(f"{base_url}/sse/messages", data=payload, timeout=30)
             if response.status_code == 200:
-                result = response.json()
-                if "result" in result and "deleted" in result["result"].lower():
-                    print(f" Deleted cloned VM: {result['result']}")
+                result = _rjson(response)
+                if succeeded("deleteVM", result):
+                    log(f" Deleted cloned VM: {result['result']}")
                 else:
-                    print(f"️  Clone VM deletion result: {result}")
+                    log(f"️  Clone VM deletion result: {result}")
             else:
-                print(f" Clone VM deletion HTTP error: {response.status_code}")
+                log(f" Clone VM deletion HTTP error: {response.status_code}")
 
         # Delete main test VM
-        print(f"   Deleting test VM '{test_vm_name}'...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 9,
-            "method": "tools/call",
-            "params": {
-                "name": "deleteVM",
-                "arguments": {
-                    "name": test_vm_name
-                }
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=30)
+        log(f"   Deleting test VM '{test_vm_name}'...")
+        payload = rpc(9, "deleteVM", {"name": test_vm_name})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=30)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result and "deleted" in result["result"].lower():
-                print(f" Deleted test VM: {result['result']}")
+            result = _rjson(response)
+            if succeeded("deleteVM", result):
+                log(f" Deleted test VM: {result['result']}")
             else:
-                print(f" Test VM deletion failed: {result}")
+                log(f" Test VM deletion failed: {result}")
                 return False
         else:
-            print(f" Test VM deletion HTTP error: {response.status_code}")
+            log(f" Test VM deletion HTTP error: {response.status_code}")
             return False
 
         # Step 10: Final verification
-        print("\n10. Final verification...")
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 10,
-            "method": "tools/call",
-            "params": {
-                "name": "listVMs",
-                "arguments": {}
-            }
-        }
-
-        response = session.post(f"{base_url}/sse/messages", json=payload, timeout=10)
+        log("\n10. Final verification...")
+        payload = rpc(10, "listVMs", {})
+
+        response = session.post(f"{base_url}/sse/messages", data=payload, timeout=10, stream=True)
         if response.status_code == 200:
-            result = response.json()
-            if "result" in result:
-                final_vm_list = result["result"]
-                print(f" Final VM count: {len(final_vm_list)} (started with {initial_vm_count})")
+            scan = _scan_vm_list(response, wanted={test_vm_name, clone_vm_name})
+            if scan:
+                final_vm_count, final_vm_list, _ = scan  # Only the wanted names that were seen
+                log(f" Final VM count: {final_vm_count} (started with {initial_vm_count})")
 
                 if test_vm_name not in final_vm_list:
-                    print(f" Test VM '{test_vm_name}' successfully cleaned up")
+                    log(f" Test VM '{test_vm_name}' successfully cleaned up")
                 else:
-                    print(f" Test VM '{test_vm_name}' still exists")
+                    log(f" Test VM '{test_vm_name}' still exists")
                     return False
 
                 if not cloned_created or clone_vm_name not in final_vm_list:
-                    print(" All test VMs cleaned up successfully")
+                    log(" All test VMs cleaned up successfully")
                 else:
-                    print(f" Cloned VM '{clone_vm_name}' still exists")
+                    log(f" Cloned VM '{clone_vm_name}' still exists")
                     return False
             else:
-                print(f" Final verification failed: {result}")
+                log(" Final verification failed: no result in response")
                 return False
 
-        print("\n ALL MCP SERVER TESTS COMPLETED SUCCESSFULLY!")
-        print("=" * 60)
-        print(" Tested tools: listVMs, createVM, powerOn, powerOff, cloneVM, deleteVM")
-        print(" Tested resources: vmStats")
-        print(" Verified cleanup and state consistency")
+        log("\n ALL MCP SERVER TESTS COMPLETED SUCCESSFULLY!")
+        log("=" * 60)
+        log(" Tested tools: listVMs, createVM, powerOn, powerOff, cloneVM, deleteVM")
+        log(" Tested resources: vmStats")
+        log(" Verified cleanup and state consistency")
 
         return True
 
     except Exception as e:
-        print(f" Test suite failed with error: {e}")
+        log(f" Test suite failed with error: {e}")
         return False
 
+async def test_mcp_tools_async(http2=False):
+    """Same checks as test_mcp_tools, with calls that don't depend on each other run concurrently"""
+    base_url = "http://localhost:8090"
+    test_vm_name = "mcp-comprehensive-test"
+    clone_vm_name = "mcp-clone-test"
+
+    log(" COMPREHENSIVE VMWARE MCP SERVER TEST (async)")
+    log("=" * 60)
+
+    # With http2, an h2 connection carries the SSE stream and concurrent calls as multiplexed streams.
+    # h2 is only negotiated through ALPN on TLS, so against a plain-HTTP server (uvicorn never speaks
+    # HTTP/2) the client falls back to HTTP/1.1, and the pool must leave room beside the SSE stream.
+    limits = httpx.Limits(max_keepalive_connections=8)
+    async with httpx.AsyncClient(base_url=base_url, http2=http2, limits=limits, timeout=60,
+                                 headers={**JSON_HEADERS, **COMPRESSION_HEADERS}) as client:
+
+        async def post(body):
+            response = await client.post("/sse/messages", content=body)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+
+        async def call(id_, name, arguments):
+            return await post(rpc(id_, name, arguments))
+
+        # Step 1: hold the SSE stream open for the whole run (required for MCP protocol)
+        sse_ready = asyncio.Event()
+        sse_status = {}
+
+        async def hold_sse():
+            async with client.stream("GET", "/sse", timeout=None) as response:
+                sse_status["code"] = response.status_code
+                sse_ready.set()
+                async for _ in response.aiter_bytes():
+                    pass
+
+        sse_task = asyncio.create_task(hold_sse())
+        try:
+            log("\n1. Establishing SSE Connection...")
+            try:
+                await asyncio.wait_for(sse_ready.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                log(" SSE connection error: timed out")
+                return False
+            if sse_status["code"] != 200:
+                log(f" SSE connection failed: {sse_status['code']}")
+                return False
+            log(" SSE connection established")
+
+            log("\n2. Testing listVMs tool...")
+            response = await client.post("/sse/messages", content=rpc(1, "listVMs", {}))
+            response.raise_for_status()
+            if http2 and response.http_version != "HTTP/2":
+                log(f" HTTP/2 not negotiated with {base_url}, continuing over {response.http_version}")
+            result = orjson.loads(response.content)
+            if "result" not in result:
+                log(f" listVMs failed: {result}")
+                return False
+            vm_list = result["result"]
+            initial_vm_count = len(vm_list)
+            log(f" listVMs successful: Found {initial_vm_count} VMs")
+
+            log(f"\n3. Testing createVM tool (creating '{test_vm_name}')...")
+            result = await call(2, "createVM", {"name": test_vm_name, "cpu": 1, "memory": 512})
+            if not succeeded("createVM", result):
+                log(f" createVM failed: {result}")
+                return False
+            log(f" createVM successful: {result['result']}")
+
+            # Both only need the VM to exist
+            log("\n4-5. Verifying VM creation and reading vmStats...")
+            listed, stats = await asyncio.gather(
+                call(3, "listVMs", {}),
+                post(read_resource(4, f"vmstats://{test_vm_name}")))
+            if test_vm_name not in listed.get("result", []):
+                log(f" VM '{test_vm_name}' not found in list")
+                return False
+            log(f" VM '{test_vm_name}' found in list ({len(listed['result'])} total VMs)")
+            if "result" in stats and "contents" in stats["result"]:
+                stats_dict = orjson.loads(stats["result"]["contents"][0]["text"])
+                log(f" vmStats successful: CPU {stats_dict.get('cpu_usage_mhz', 'N/A')} MHz, "
+                      f"Memory {stats_dict.get('memory_usage_mb', 'N/A')} MB")
+            else:
+                log(f" vmStats failed: {stats}")
+
+            async def power_cycle():
+                # powerOff must follow powerOn
+                on = await call(5, "powerOn", {"name": test_vm_name})
+                off = await call(6, "powerOff", {"name": test_vm_name})
+                return on, off
+
+            async def clone():
+                existing_vms = [vm for vm in vm_list if vm != test_vm_name]
+                if not existing_vms:
+                    return None
+                return await call(7, "cloneVM", {"template_name": existing_vms[0], "new_name": clone_vm_name})
+
+            # The clone source is a pre-existing VM, so cloning overlaps the power cycle
+            log("\n6-8. Testing powerOn/powerOff and cloneVM...")
+            (on, off), cloned = await asyncio.gather(power_cycle(), clone())
+            log(f" powerOn result: {on.get('result', on)}")
+            log(f" powerOff result: {off.get('result', off)}")
+            cloned_created = succeeded("cloneVM", cloned)
+            if cloned is None:
+                log(" Skipping cloneVM test (no source VMs available)")
+            elif cloned_created:
+                log(f" cloneVM successful: {cloned['result']}")
+            else:
+                log(f" cloneVM failed: {cloned}")
+
+            log("\n9. Cleaning up - deleting test VMs...")
+            deletions = [call(9, "deleteVM", {"name": test_vm_name})]
+            if cloned_created:
+                deletions.append(call(8, "deleteVM", {"name": clone_vm_name}))
+            deleted = await asyncio.gather(*deletions)
+            if not succeeded("deleteVM", deleted[0]):
+                log(f" Test VM deletion failed: {deleted[0]}")
+                return False
+            log(f" Deleted test VM: {deleted[0]['result']}")
+
+            log("\n10. Final verification...")
+            final_vm_list = (await call(10, "listVMs", {})).get("result", [])
+            log(f" Final VM count: {len(final_vm_list)} (started with {initial_vm_count})")
+            if test_vm_name in final_vm_list or (cloned_created and clone_vm_name in final_vm_list):
+                log(" Test VMs still exist after cleanup")
+                return False
+
+            log("\n ALL MCP SERVER TESTS COMPLETED SUCCESSFULLY!")
+            log("=" * 60)
+            return True
+        except Exception as e:
+            log(f" Test suite failed with error: {e}")
+            return False
+        finally:
+            sse_task.cancel()
+
 if __name__ == "__main__":
-    success = test_mcp_tools()
+    try:
+        if "--async" in sys.argv[1:] or "--http2" in sys.argv[1:]:
+            success = asyncio.run(test_mcp_tools_async(http2="--http2" in sys.argv[1:]))
+        else:
+            success = test_mcp_tools()
+    finally:
+        flush_log()
     exit(0 if success else 1)
@@ -1,80 +1,124 @@
 #!/usr/bin/env python3
-import ssl
-from pyVim import connect
-from pyVmomi import vim
-
-def create_test_vm():
+import argparse
+import pathlib
+from dataclasses import dataclass, asdict, fields as dataclass_fields
+from typing import Optional
+import orjson
+from pyVmomi import vim, vmodl, VmomiSupport
+from _common import CONFIG, get_si, get_content, get_vms_by_name, wait_for_task_chain
+
+# Resolved MoRef ids per vCenter host, so repeated runs skip the inventory walk
+INVENTORY_CACHE = pathlib.Path("~/.cache/esxi-mcp/inventory.json").expanduser()
+
+@dataclass
+class InventoryRefs:
+    """MoRefs serialized as "WsdlType:moId" strings; network is None when there is no VM Network."""
+    datacenter: str
+    resource_pool: str
+    datastore: str
+    network: Optional[str] = None
+
+def _ref_to_str(obj):
+    return f"{obj._wsdlName}:{obj._moId}" if obj is not None else None
+
+def _str_to_ref(si, ref):
+    if ref is None:
+        return None
+    wsdl_name, moid = ref.split(":", 1)
+    return VmomiSupport.GetWsdlType("urn:vim25", wsdl_name)(moid, si._stub)
+
+def discover_inventory(content):
+    """Walk the inventory for the first datacenter's resource pool, largest datastore and VM Network."""
+    # Get datacenter and other objects
+    datacenter_obj = next((dc for dc in content.rootFolder.childEntity
+                          if isinstance(dc, vim.Datacenter)), None)
+    if not datacenter_obj:
+        raise Exception("No datacenter object found")
+
+    # Get resource pool
+    compute_resource = next((cr for cr in datacenter_obj.hostFolder.childEntity
+                          if isinstance(cr, vim.ComputeResource)), None)
+    if not compute_resource:
+        raise Exception("No compute resource (cluster or host) found")
+    resource_pool = compute_resource.resourcePool
+
+    # Get datastore (largest available); free space of every datastore in one call
+    pc = vmodl.query.PropertyCollector
+    spec = pc.FilterSpec(
+        objectSet=[pc.ObjectSpec(obj=datacenter_obj.datastoreFolder, skip=True, selectSet=[
+            pc.TraversalSpec(name="traverseChildren", path="childEntity", type=vim.Folder)])],
+        propSet=[pc.PropertySpec(type=vim.Datastore, pathSet=["summary.freeSpace"])])
+    datastores = [(obj.obj, obj.propSet[0].val) for obj in content.propertyCollector.RetrieveContents([spec])
+                  if obj.propSet]
+    if not datastores:
+        raise Exception("No available datastore found in the datacenter")
+    datastore_obj = max(datastores, key=lambda ds: ds[1])[0]
+
+    # Get network
+    networks = datacenter_obj.networkFolder.childEntity
+    network_obj = next((net for net in networks if net.name == "VM Network"), None)
+
+    return datacenter_obj, resource_pool, datastore_obj, network_obj
+
+def _load_inventory_cache():
+    try:
+        return orjson.loads(INVENTORY_CACHE.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def resolve_inventory(si, content, host, use_cache=True):
+    """Return (datacenter, resource_pool, datastore, network), reusing cached MoRef ids for host.
+
+    Cached refs are checked with one property fetch; if any no longer exists the cache
+    entry is dropped and the inventory is walked again.
+    """
+    cache = _load_inventory_cache() if use_cache else {}
+    if host in cache:
+        refs = InventoryRefs(**cache[host])
+        objs = tuple(_str_to_ref(si, getattr(refs, f.name)) for f in dataclass_fields(InventoryRefs))
+        pc = vmodl.query.PropertyCollector
+        spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=obj) for obj in objs if obj is not None],
+            propSet=[pc.PropertySpec(type=t, pathSet=["name"]) for t in {type(obj) for obj in objs if obj is not None}])
+        try:
+            content.propertyCollector.RetrieveContents([spec])
+            return objs
+        except vmodl.fault.ManagedObjectNotFound:
+            print("Cached inventory is stale, rediscovering...")
+    objs = discover_inventory(content)
+    if use_cache:
+        cache[host] = asdict(InventoryRefs(*map(_ref_to_str, objs)))
+        INVENTORY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        INVENTORY_CACHE.write_bytes(orjson.dumps(cache))
+    return objs
+
+def create_test_vm(power_on=False, use_cache=True):
     try:
-        # Configuration from config.yaml
-        vcenter_host = "192.168.203.178"
-        vcenter_user = "root"
-        vcenter_password = "TempP@ssw0rd"
-        insecure = True
         test_vm_name = "mcp-test"
 
-        print(f"Connecting to ESXi at {vcenter_host}...")
-
-        if insecure:
-            # Connection method without SSL certificate verification
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            context.check_hostname = False  # Disable hostname checking
-            context.verify_mode = ssl.CERT_NONE
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password,
-                sslContext=context)
-        else:
-            # Standard SSL verification connection
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password)
+        print(f"Connecting to ESXi at {CONFIG['vcenter_host']}...")
+
+        # Reuses the session if another script in this process already connected
+        si = get_si()
 
         print("Successfully connected to ESXi")
 
         # Retrieve content root object
-        content = si.RetrieveContent()
-
-        # Get datacenter and other objects
-        datacenter_obj = next((dc for dc in content.rootFolder.childEntity
-                              if isinstance(dc, vim.Datacenter)), None)
-        if not datacenter_obj:
-            raise Exception("No datacenter object found")
-
-        # Get resource pool
-        compute_resource = next((cr for cr in datacenter_obj.hostFolder.childEntity
-                              if isinstance(cr, vim.ComputeResource)), None)
-        if not compute_resource:
-            raise Exception("No compute resource (cluster or host) found")
-        resource_pool = compute_resource.resourcePool
-
-        # Get datastore (largest available)
-        datastores = [ds for ds in datacenter_obj.datastoreFolder.childEntity if isinstance(ds, vim.Datastore)]
-        if not datastores:
-            raise Exception("No available datastore found in the datacenter")
-        datastore_obj = max(datastores, key=lambda ds: ds.summary.freeSpace)
-
-        # Get network
-        networks = datacenter_obj.networkFolder.childEntity
-        network_obj = next((net for net in networks if net.name == "VM Network"), None)
+        content = get_content()
+
+        # Datacenter, resource pool, datastore and network (from the on-disk cache when valid)
+        datacenter_obj, resource_pool, datastore_obj, network_obj = resolve_inventory(
+            si, content, CONFIG["vcenter_host"], use_cache=use_cache)
 
         print(f"Using resource pool: {resource_pool.name}")
         print(f"Using datastore: {datastore_obj.name}")
         print(f"Using network: {network_obj.name if network_obj else 'None'}")
 
         # Check if VM already exists
-        container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-        existing_vm = None
-        for vm in container.view:
-            if vm.name == test_vm_name:
-                existing_vm = vm
-                break
-        container.Destroy()
+        existing_vm = get_vms_by_name().get(test_vm_name)
 
         if existing_vm:
             print(f"VM '{test_vm_name}' already exists!")
-            connect.Disconnect(si)
             return True
 
         # Create test VM
@@ -135,18 +179,11 @@ def create_test_vm():
         vm_folder = datacenter_obj.vmFolder
         task = vm_folder.CreateVM_Task(config=vm_spec, pool=resource_pool)
 
-        # Wait for task completion
-        print("Creating VM...")
-        while task.info.state not in [vim.TaskInfo.State.success, vim.TaskInfo.State.error]:
-            continue
-
-        if task.info.state == vim.TaskInfo.State.error:
-            raise task.info.error
-
-        print(f" VM '{test_vm_name}' created successfully!")
+        # Wait for task completion; power-on is queued the moment the VM exists
+        print("Creating VM..." + (" and powering it on..." if power_on else ""))
+        wait_for_task_chain(task, then=(lambda vm: vm.PowerOnVM_Task()) if power_on else None)
 
-        # Clean up
-        connect.Disconnect(si)
+        print(f" VM '{test_vm_name}' created successfully!" + (" (powered on)" if power_on else ""))
 
         print(f"\n VM '{test_vm_name}' is now ready for testing!")
         return True
@@ -156,4 +193,8 @@ def create_test_vm():
         return False
 
 if __name__ == "__main__":
-    create_test_vm()
+    parser = argparse.ArgumentParser(description="Create the mcp-test VM")
+    parser.add_argument("--power-on", action="store_true", help="Power the VM on right after it is created")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the inventory cache")
+    args = parser.parse_args()
+    create_test_vm(power_on=args.power_on, use_cache=not args.no_cache)
@@ -1,49 +1,56 @@
 #!/usr/bin/env python3
-import ssl
-from pyVim import connect
-from pyVmomi import vim
-
-def list_available_vms(content):
-    """List all available VMs for reference."""
-    container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-    vm_list = [vm.name for vm in container.view]
-    container.Destroy()
-    return vm_list
-
-def delete_test_vm():
-    try:
-        # Configuration from config.yaml
-        vcenter_host = "192.168.203.178"
-        vcenter_user = "root"
-        vcenter_password = "TempP@ssw0rd"
-        insecure = True
-
-        print(f"Connecting to ESXi at {vcenter_host}...")
-
-        if insecure:
-            # Connection method without SSL certificate verification
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            context.check_hostname = False  # Disable hostname checking
-            context.verify_mode = ssl.CERT_NONE
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password,
-                sslContext=context)
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from _common import CONFIG, get_si, get_vms_by_name, get_vm_names, wait_for_task, wait_for_tasks
+
+def delete_vms(vm_names, yes=False):
+    """Delete several VMs at once: all Destroy_Tasks are started, then awaited together."""
+    vms_by_name = get_vms_by_name()
+    missing = [name for name in vm_names if name not in vms_by_name]
+    for name in missing:
+        print(f" VM '{name}' not found - skipping")
+    targets = [name for name in vm_names if name in vms_by_name]
+    if not targets:
+        return not missing
+    if not yes:
+        confirm = input(f"Are you sure you want to delete {', '.join(targets)}? (yes/no): ").strip().lower()
+        if confirm not in ['yes', 'y']:
+            print("Deletion cancelled.")
+            return False
+
+    print(f"--- Deleting {len(targets)} VMs ---")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tasks = dict(zip(targets, executor.map(lambda name: vms_by_name[name].Destroy_Task(), targets)))
+    errors = wait_for_tasks(list(tasks.values()))
+
+    remaining = set(get_vm_names())
+    ok = not missing
+    for name, task in tasks.items():
+        if errors[task]:
+            print(f" Error deleting VM '{name}': {errors[task]}")
+            ok = False
+        elif name in remaining:
+            print(f" Warning: VM '{name}' still exists after deletion attempt")
+            ok = False
         else:
-            # Standard SSL verification connection
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password)
+            print(f" Confirmed: VM '{name}' has been removed")
+    return ok
+
+def delete_test_vm(vms=None, yes=False):
+    try:
+        print(f"Connecting to ESXi at {CONFIG['vcenter_host']}...")
+
+        # Reuses the session if another script in this process already connected
+        get_si()
 
         print("Successfully connected to ESXi")
 
-        # Retrieve content root object
-        content = si.RetrieveContent()
+        if vms:
+            # Batch mode: no prompts except one confirmation (skipped with --yes)
+            return delete_vms(vms, yes)
 
         # List available VMs
-        available_vms = list_available_vms(content)
+        available_vms = get_vm_names()
         print(f"\nAvailable VMs ({len(available_vms)}):")
         for i, vm_name in enumerate(available_vms, 1):
             print(f"  {i:2d}. {vm_name}")
@@ -67,13 +74,7 @@ def delete_test_vm():
 
             try:
                 # Find the VM
-                container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-                vm_obj = None
-                for vm in container.view:
-                    if vm.name == vm_name:
-                        vm_obj = vm
-                        break
-                container.Destroy()
+                vm_obj = get_vms_by_name().get(vm_name)
 
                 if not vm_obj:
                     print(f"VM '{vm_name}' not found - may have been deleted already")
@@ -83,26 +84,17 @@ def delete_test_vm():
                 print(f"--- Deleting VM '{vm_name}' ---")
                 task = vm_obj.Destroy_Task()
                 print("Deleting VM...")
-                while task.info.state not in [vim.TaskInfo.State.success, vim.TaskInfo.State.error]:
-                    continue
-
-                if task.info.state == vim.TaskInfo.State.error:
-                    raise task.info.error
+                wait_for_task(task)
 
                 print(f" VM '{vm_name}' deleted successfully!")
 
-                # Verify deletion
-                container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-                vm_still_exists = any(vm.name == vm_name for vm in container.view)
-                container.Destroy()
-
-                if vm_still_exists:
+                # Verify deletion and refresh the available VMs list from one listing
+                available_vms = get_vm_names()
+                if vm_name in available_vms:
                     print(f" Warning: VM '{vm_name}' still exists after deletion attempt")
                 else:
                     print(f" Confirmed: VM '{vm_name}' has been removed")
 
-                # Update available VMs list
-                available_vms = list_available_vms(content)
                 print(f"\nUpdated VM list ({len(available_vms)}):")
                 for i, vm_name in enumerate(available_vms, 1):
                     print(f"  {i:2d}. {vm_name}")
@@ -110,8 +102,6 @@ def delete_test_vm():
             except Exception as e:
                 print(f" Error deleting VM '{vm_name}': {e}")
 
-        # Clean up
-        connect.Disconnect(si)
         print("\n VM deletion session completed!")
 
     except Exception as e:
@@ -121,4 +111,9 @@ def delete_test_vm():
     return True
 
 if __name__ == "__main__":
-    delete_test_vm()
+    parser = argparse.ArgumentParser(description="Delete VMs interactively, or in batch with --vms")
+    parser.add_argument("--vms", help="Comma-separated VM names to delete without the interactive loop")
+    parser.add_argument("--yes", action="store_true", help="Do not ask for confirmation in batch mode")
+    args = parser.parse_args()
+    vms = [name.strip() for name in args.vms.split(",") if name.strip()] if args.vms else None
+    exit(0 if delete_test_vm(vms, args.yes) else 1)
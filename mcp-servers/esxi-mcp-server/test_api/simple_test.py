@@ -1,55 +1,23 @@
 #!/usr/bin/env python3
-import ssl
-from pyVim import connect
-from pyVmomi import vim
+from _common import CONFIG, get_si, get_vm_names
 
 def test_list_vms():
     try:
-        # Configuration from config.yaml
-        vcenter_host = "192.168.203.178"
-        vcenter_user = "root"
-        vcenter_password = "TempP@ssw0rd"
-        insecure = True
-
-        print(f"Connecting to ESXi at {vcenter_host}...")
-
-        if insecure:
-            # Connection method without SSL certificate verification
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            context.check_hostname = False  # Disable hostname checking
-            context.verify_mode = ssl.CERT_NONE
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password,
-                sslContext=context)
-        else:
-            # Standard SSL verification connection
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password)
+        print(f"Connecting to ESXi at {CONFIG['vcenter_host']}...")
 
-        print("Successfully connected to ESXi")
+        # Reuses the session if another script in this process already connected
+        get_si()
 
-        # Retrieve content root object
-        content = si.RetrieveContent()
+        print("Successfully connected to ESXi")
 
         # List all VMs
         print("Listing VMs...")
-        container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-        vm_list = []
-        for vm in container.view:
-            vm_list.append(vm.name)
-        container.Destroy()
+        vm_list = get_vm_names()
 
         print(f"Found {len(vm_list)} VMs:")
         for vm_name in vm_list:
             print(f"- {vm_name}")
 
-        # Clean up
-        connect.Disconnect(si)
-
         return vm_list
 
     except Exception as e:
@@ -1,60 +1,157 @@
 #!/usr/bin/env python3
-import ssl
-from pyVim import connect
-from pyVmomi import vim
-
-def get_vm_performance(content, vm_name):
-    """Retrieve performance data for the specified virtual machine."""
-    # Find VM
-    container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-    vm_obj = None
-    for vm in container.view:
-        if vm.name == vm_name:
-            vm_obj = vm
-            break
-    container.Destroy()
-
-    if not vm_obj:
-        raise Exception(f"VM {vm_name} not found")
-
-    # CPU and memory usage (obtained from quickStats)
-    stats = {}
-    qs = vm_obj.summary.quickStats
-    stats["cpu_usage_mhz"] = qs.overallCpuUsage  # MHz
-    stats["memory_usage_mb"] = qs.guestMemoryUsage  # MB
-
-    # Storage usage (committed storage, in GB)
-    committed = vm_obj.summary.storage.committed if vm_obj.summary.storage else 0
-    stats["storage_usage_gb"] = round(committed / (1024**3), 2)  # Convert to GB
-
-    # Network usage (obtained from host or VM NIC statistics, latest sample)
-    net_bytes_transmitted = 0
-    net_bytes_received = 0
+import asyncio
+import threading
+from pyVmomi import vim, vmodl
+from _common import CONFIG, get_si, get_content
+
+VM_PROPERTIES = [
+    "name",
+    "summary.quickStats.overallCpuUsage",
+    "summary.quickStats.guestMemoryUsage",
+    "summary.storage.committed",
+]
+
+# VirtualMachine -> {property path: value}, kept current by watch_vm_properties()
+_vm_props = {}
+_vm_props_lock = threading.Lock()
+_vm_props_ready = threading.Event()
+_watcher = None
+_watcher_error = None
+
+def watch_vm_properties(content):
+    """Apply PropertyCollector updates for VM_PROPERTIES of every VM to _vm_props until the session ends.
+
+    The first WaitForUpdatesEx returns the full state (paged by maxObjectUpdates); after that
+    vCenter only sends the properties that changed since the previous version.
+    """
+    global _watcher_error
+    pc = vmodl.query.PropertyCollector
+    # A private collector, so updates here never mix with task waits on the shared one
+    collector = content.propertyCollector.CreatePropertyCollector()
+    view = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
     try:
-        pm = content.perfManager
-        # Define performance counter IDs to query: network transmitted and received bytes
-        counter_ids = []
-        for c in pm.perfCounter:
-            counter_full_name = f"{c.groupInfo.key}.{c.nameInfo.key}.{c.rollupType}"
-            if counter_full_name in ("net.transmitted.average", "net.received.average"):
-                counter_ids.append(c.key)
-        if counter_ids:
-            query = vim.PerformanceManager.QuerySpec(maxSample=1, entity=vm_obj, metricId=[vim.PerformanceManager.MetricId(counterId=cid, instance="*") for cid in counter_ids])
-            stats_res = pm.QueryStats(querySpec=[query])
-            for series in stats_res[0].value:
-                # Sum data from each network interface
-                if series.id.counterId == counter_ids[0]:
-                    net_bytes_transmitted = sum(series.value)
-                elif series.id.counterId == counter_ids[1]:
-                    net_bytes_received = sum(series.value)
-        stats["network_transmit_kbps"] = net_bytes_transmitted
-        stats["network_receive_kbps"] = net_bytes_received
+        collector.CreateFilter(pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=view, skip=True, selectSet=[
+                pc.TraversalSpec(name="traverseView", path="view", type=vim.view.ContainerView)])],
+            propSet=[pc.PropertySpec(type=vim.VirtualMachine, pathSet=VM_PROPERTIES)]), True)
+        version = ""
+        while True:
+            update = collector.WaitForUpdatesEx(version, pc.WaitOptions(maxWaitSeconds=30, maxObjectUpdates=1000))
+            if update is None:
+                continue  # No change within maxWaitSeconds
+            version = update.version
+            with _vm_props_lock:
+                for filter_update in update.filterSet:
+                    for object_update in filter_update.objectSet:
+                        if object_update.kind == "leave":
+                            _vm_props.pop(object_update.obj, None)
+                            continue
+                        props = _vm_props.setdefault(object_update.obj, {})
+                        for change in object_update.changeSet:
+                            if change.op == "remove" or change.val is None:
+                                props.pop(change.name, None)
+                            else:
+                                props[change.name] = change.val
+            if not update.truncated:
+                _vm_props_ready.set()
     except Exception as e:
-        print(f"Warning: Failed to retrieve network performance data: {e}")
-        stats["network_transmit_kbps"] = None
-        stats["network_receive_kbps"] = None
+        _watcher_error = e
+    finally:
+        _vm_props_ready.set()
+        try:
+            view.Destroy()
+            collector.Destroy()
+        except Exception:
+            pass
+
+def fetch_vm_properties(content):
+    """Snapshot {VM name: (VirtualMachine, properties)} from the live cache, starting the watcher on first use."""
+    global _watcher
+    if _watcher is None:
+        _watcher = threading.Thread(target=watch_vm_properties, args=(content,), name="vm-properties", daemon=True)
+        _watcher.start()
+    _vm_props_ready.wait()
+    if _watcher_error is not None:
+        raise _watcher_error
+    with _vm_props_lock:
+        return {props["name"]: (vm, dict(props)) for vm, props in _vm_props.items()}
+
+# Network counters summed across NICs: transmitted and received KB/s
+NET_COUNTERS = {"net.transmitted.average": "network_transmit_kbps", "net.received.average": "network_receive_kbps"}
+
+# vCenter rejects a QueryPerf with more entity x counter pairs than vpxd.stats.maxQueryMetrics
+MAX_QUERY_METRICS = 254
+
+# id(perfManager) -> {"group.name.rollup": counter id}; ids are stable for a connection's lifetime
+_counter_id_cache: dict[int, dict[str, int]] = {}
+
+def get_counter_ids(pm, names):
+    """Counter ids for the full counter names (None if the server has no such counter).
+
+    pm.perfCounter is itself a SOAP round trip returning hundreds of entries, so it is read
+    once per PerformanceManager and the lookup table reused afterwards.
+    """
+    cache = _counter_id_cache.setdefault(id(pm), {})
+    if not cache:
+        cache.update({f"{c.groupInfo.key}.{c.nameInfo.key}.{c.rollupType}": c.key for c in pm.perfCounter})
+    return [cache.get(name) for name in names]
+
+def get_network_stats(content, vm_objs):
+    """Latest network sample for each VM, with one QueryPerf per MAX_QUERY_METRICS metrics instead of one per VM."""
+    pm = content.perfManager
+    counter_ids = get_counter_ids(pm, NET_COUNTERS)
+    key_by_id = {cid: key for cid, key in zip(counter_ids, NET_COUNTERS.values()) if cid is not None}
+    if not key_by_id:
+        raise Exception("network counters not available")
+    # Instance "" is vCenter's aggregate over all of the VM's NICs: one series per counter instead of one per NIC
+    metric_ids = [vim.PerformanceManager.MetricId(counterId=cid, instance="") for cid in key_by_id]
+    specs = [vim.PerformanceManager.QuerySpec(maxSample=1, entity=vm, metricId=metric_ids) for vm in vm_objs]
+    per_query = max(1, MAX_QUERY_METRICS // len(metric_ids))
+    results = {}
+    for i in range(0, len(specs), per_query):
+        for entity_metric in pm.QueryStats(querySpec=specs[i:i + per_query]):
+            stats = dict.fromkeys(NET_COUNTERS.values(), 0)
+            for series in entity_metric.value:
+                stats[key_by_id[series.id.counterId]] = sum(series.value)
+            results[entity_metric.entity] = stats
+    return results
 
-    return stats
+def get_vm_performance(content, vm_names, network=None):
+    """Retrieve performance data for the specified virtual machines; returns {vm name: stats}.
+
+    network is an already fetched {VirtualMachine: network stats} (see get_network_stats);
+    when omitted it is queried for all the VMs together.
+    """
+    vms = fetch_vm_properties(content)
+    for vm_name in vm_names:
+        if vm_name not in vms:
+            raise Exception(f"VM {vm_name} not found")
+
+    # Network usage (latest sample of the VM NIC statistics), queried for all VMs together
+    if network is None:
+        try:
+            network = get_network_stats(content, [vms[vm_name][0] for vm_name in vm_names])
+        except Exception as e:
+            print(f"Warning: Failed to retrieve network performance data: {e}")
+            network = {}
+
+    all_stats = {}
+    for vm_name in vm_names:
+        vm_obj, props = vms[vm_name]
+
+        # CPU and memory usage (obtained from quickStats)
+        stats = {}
+        stats["cpu_usage_mhz"] = props.get("summary.quickStats.overallCpuUsage")  # MHz
+        stats["memory_usage_mb"] = props.get("summary.quickStats.guestMemoryUsage")  # MB
+
+        # Storage usage (committed storage, in GB)
+        committed = props.get("summary.storage.committed", 0)
+        stats["storage_usage_gb"] = round(committed / (1024**3), 2)  # Convert to GB
+
+        stats.update(network.get(vm_obj, dict.fromkeys(NET_COUNTERS.values())))
+        all_stats[vm_name] = stats
+
+    return all_stats
 
 def display_performance_stats(vm_name, stats):
     """Display performance statistics in a formatted way."""
@@ -76,52 +173,49 @@ def display_performance_stats(vm_name, stats):
 
 def list_available_vms(content):
     """List all available VMs for reference."""
-    container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-    vm_list = [vm.name for vm in container.view]
-    container.Destroy()
-    return vm_list
+    return list(fetch_vm_properties(content))
 
-def test_vm_performance():
-    try:
-        # Configuration from config.yaml
-        vcenter_host = "192.168.203.178"
-        vcenter_user = "root"
-        vcenter_password = "TempP@ssw0rd"
-        insecure = True
-
-        print(f"Connecting to ESXi at {vcenter_host}...")
-
-        if insecure:
-            # Connection method without SSL certificate verification
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            context.check_hostname = False  # Disable hostname checking
-            context.verify_mode = ssl.CERT_NONE
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password,
-                sslContext=context)
-        else:
-            # Standard SSL verification connection
-            si = connect.SmartConnect(
-                host=vcenter_host,
-                user=vcenter_user,
-                pwd=vcenter_password)
+# vSphere's realtime statistics are sampled every 20s, so refreshing faster gains nothing
+PREFETCH_INTERVAL = 20
+# How many of the busiest VMs (by CPU) have their network stats prefetched
+PREFETCH_TOP_N = 50
 
-        print("Successfully connected to ESXi")
+async def prefetch_loop(content, network_cache):
+    """Every PREFETCH_INTERVAL, refresh network_cache with network stats of the PREFETCH_TOP_N busiest VMs."""
+    loop = asyncio.get_running_loop()
+    while True:
+        vms = fetch_vm_properties(content).values()
+        busiest = sorted(vms, key=lambda vm: vm[1].get("summary.quickStats.overallCpuUsage") or 0, reverse=True)
+        try:
+            network_cache.update(await loop.run_in_executor(
+                None, get_network_stats, content, [vm_obj for vm_obj, _ in busiest[:PREFETCH_TOP_N]]))
+        except Exception:
+            pass  # Prompts fall back to querying, which reports the error
+        await asyncio.sleep(PREFETCH_INTERVAL)
 
-        # Retrieve content root object
-        content = si.RetrieveContent()
+def ainput(prompt):
+    """input() on a daemon thread, so a pending prompt never keeps the process alive."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
 
-        # List available VMs
-        available_vms = list_available_vms(content)
-        print(f"\nAvailable VMs ({len(available_vms)}):")
-        for i, vm_name in enumerate(available_vms, 1):
-            print(f"  {i:2d}. {vm_name}")
+    def read():
+        try:
+            loop.call_soon_threadsafe(future.set_result, input(prompt))
+        except BaseException as e:
+            loop.call_soon_threadsafe(future.set_exception, e)
+
+    threading.Thread(target=read, daemon=True).start()
+    return future
 
+async def interactive_loop(content, available_vms):
+    """Prompt for VMs while stats are prefetched in the background during the user's think time."""
+    loop = asyncio.get_running_loop()
+    network_cache = {}
+    prefetch = asyncio.create_task(prefetch_loop(content, network_cache))
+    try:
         # Prompt for VM name
         while True:
-            vm_name = input("\nEnter VM name to check performance (or 'quit' to exit): ").strip()
+            vm_name = (await ainput("\nEnter VM name to check performance (or 'quit' to exit): ")).strip()
 
             if vm_name.lower() == 'quit':
                 break
@@ -131,18 +225,43 @@ def test_vm_performance():
                 continue
 
             try:
-                # Get performance data
-                stats = get_vm_performance(content, vm_name)
+                # Get performance data: CPU, memory and storage come from the live property cache,
+                # network from the prefetch when available, otherwise from a QueryPerf off the event loop
+                vm_obj = fetch_vm_properties(content)[vm_name][0]
+                if vm_obj in network_cache:
+                    stats = get_vm_performance(content, [vm_name], network_cache)[vm_name]
+                else:
+                    stats = (await loop.run_in_executor(None, get_vm_performance, content, [vm_name]))[vm_name]
 
                 # Display results
                 display_performance_stats(vm_name, stats)
 
             except Exception as e:
                 print(f" Error retrieving performance data for VM '{vm_name}': {e}")
+    finally:
+        prefetch.cancel()
+
+def test_vm_performance():
+    try:
+        print(f"Connecting to ESXi at {CONFIG['vcenter_host']}...")
+
+        # Reuses the session if another script in this process already connected
+        get_si()
+
+        print("Successfully connected to ESXi")
+
+        # Retrieve content root object
+        content = get_content()
+
+        # List available VMs
+        available_vms = list_available_vms(content)
+        print(f"\nAvailable VMs ({len(available_vms)}):")
+        for i, vm_name in enumerate(available_vms, 1):
+            print(f"  {i:2d}. {vm_name}")
+
+        asyncio.run(interactive_loop(content, available_vms))
 
-        # Clean up
-        connect.Disconnect(si)
-        print("Disconnected from ESXi")
+        print("Performance check completed")
 
     except Exception as e:
         print(f" Test failed with error: {e}")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""In-process tests for JSON-RPC batches and notifications on POST /mcp (no vCenter needed)."""
+import os
+import sys
+from unittest import mock
+
+import httpx
+import pytest
+
+# server.py reads its settings and command line at import
+with mock.patch.dict(os.environ, {"VCENTER_HOST": "vcenter.invalid", "VCENTER_USER": "user",
+                                  "VCENTER_PASSWORD": "password"}), \
+        mock.patch.object(sys, "argv", ["server.py"]):
+    import server
+
+async def post_mcp(payload):
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        return await client.post("/mcp", json=payload)
+
+@pytest.mark.asyncio
+async def test_batch_skips_notifications():
+    """Calls and invalid members are answered in order; notifications are not."""
+    response = await post_mcp([
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"foo": 1},
+        5,
+        {"jsonrpc": "2.0", "id": 2, "method": "no/such/method"},
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(item["id"], item.get("error", {}).get("code")) for item in body] == [
+        (1, None), (None, -32601), (None, -32600), (2, -32601)
+    ]
+    assert "tools" in body[0]["result"]
+
+@pytest.mark.asyncio
+async def test_notifications_only_have_no_body():
+    """A lone notification, or a batch of nothing but notifications, gets 204 and no body."""
+    notification = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+    for payload in (notification, [notification, {"jsonrpc": "2.0", "method": "notifications/cancelled"}]):
+        response = await post_mcp(payload)
+        assert response.status_code == 204
+        assert response.content == b""
+
+@pytest.mark.asyncio
+async def test_empty_batch_is_invalid():
+    """An empty batch is a single -32600 error."""
+    response = await post_mcp([])
+
+    assert response.status_code == 200
+    assert response.json()["error"]["code"] == -32600
@@ -24,24 +24,34 @@ async def test_list_vms():
             }
         }
 
-        try:
-            response = await client.post("/sse/messages", json=tool_request)
-            print(f"POST /sse/messages response: {response.status_code}")
-            print("Response:", response.text)
-        except Exception as e:
-            print(f"Error calling tool: {e}")
+        async def call_tool():
+            return await client.post("/sse/messages", json=tool_request)
 
         # Try GET /sse (should establish SSE but return streaming response)
-        print("\nTesting SSE endpoint...")
-        try:
+        async def open_sse():
             async with client.stream("GET", "/sse") as response:
-                print(f"GET /sse status: {response.status_code}")
-                if response.status_code == 200:
-                    print("SSE connection established successfully")
-                else:
-                    print("SSE connection failed:", response.text)
-        except Exception as e:
-            print(f"SSE connection error: {e}")
+                if response.status_code != 200:
+                    await response.aread()
+                return response
+
+        # The two requests are independent, so send them concurrently and report in order
+        tool_response, sse_response = await asyncio.gather(call_tool(), open_sse(), return_exceptions=True)
+
+        if isinstance(tool_response, Exception):
+            print(f"Error calling tool: {tool_response}")
+        else:
+            print(f"POST /sse/messages response: {tool_response.status_code}")
+            print("Response:", tool_response.text)
+
+        print("\nTesting SSE endpoint...")
+        if isinstance(sse_response, Exception):
+            print(f"SSE connection error: {sse_response}")
+        else:
+            print(f"GET /sse status: {sse_response.status_code}")
+            if sse_response.status_code == 200:
+                print("SSE connection established successfully")
+            else:
+                print("SSE connection failed:", sse_response.text)
 
 if __name__ == "__main__":
     try:
@@ -5,11 +5,12 @@ No authentication, no sessions - pure stateless HTTP JSON-RPC
 """
 
 import asyncio
-import json
 import logging
 import os
+import signal
 from typing import Any, Dict, List, Optional
 import aiohttp
+import orjson
 from aiohttp import web
 import mcp.types as types
 from mcp.server import Server
@@ -20,6 +21,41 @@ import mcp.server
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("grafana-mcp")
 
+# Dashboards per /search page, and how many pages list_dashboards requests concurrently
+DASHBOARD_PAGE_SIZE = 5000
+DASHBOARD_PAGE_BATCH = 4
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    """JSON response serialized by orjson straight to bytes"""
+    return web.Response(body=orjson.dumps(data), status=status, content_type='application/json')
+
+@web.middleware
+async def cors_middleware(request: web.Request, handler) -> web.StreamResponse:
+    """Allow cross-origin JSON-RPC calls"""
+    response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    return response
+
+def result_response(request_id: Any, result: bytes) -> web.Response:
+    """JSON-RPC success response around an already serialized result"""
+    return web.Response(
+        body=b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id) + b',"result":' + result + b'}',
+        content_type='application/json')
+
+# The initialize result never changes
+INITIALIZE_RESULT = orjson.dumps({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {"listChanged": True}
+    },
+    "serverInfo": {
+        "name": "grafana-mcp",
+        "version": "1.0.0"
+    }
+})
+
 class GrafanaMCPServer:
     def __init__(self, grafana_url: str, api_token: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None):
         self.grafana_url = grafana_url.rstrip('/')
@@ -27,12 +63,45 @@ class GrafanaMCPServer:
         self.username = username
         self.password = password
         self.session: Optional[aiohttp.ClientSession] = None
+        # Dashboard UID -> in-flight fetch shared by concurrent get_dashboard calls
+        self._inflight: Dict[str, asyncio.Task] = {}
         self.server = Server("grafana-mcp")
 
+        # The tool list is static, so build it and its serialized tools/list result once
+        self.tools = self._build_tools()
+        self._tools_list_result = orjson.dumps({"tools": [{
+            "name": tool.name,
+            "description": tool.description,
+            "inputSchema": tool.inputSchema
+        } for tool in self.tools]})
+
+        # JSON-RPC method -> handler returning the serialized result
+        self._dispatch = {
+            "initialize": self._handle_initialize,
+            "tools/list": self._handle_tools_list,
+            "tools/call": self._handle_tools_call,
+        }
+
     async def initialize_session(self):
-        """Initialize HTTP session for Grafana API calls"""
+        """Initialize the shared, pooled HTTP session for Grafana API calls"""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            # Keep-alive pool reused by every request, so TCP and TLS setup is paid once per connection
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=32, keepalive_timeout=300,
+                                             ttl_dns_cache=300, enable_cleanup_closed=True)
+            timeout = aiohttp.ClientTimeout(total=None, connect=5, sock_read=30)
+
+            # Authentication is a session default - prefer API token over basic auth
+            headers = {}
+            auth = None
+            if self.api_token:
+                headers['Authorization'] = f'Bearer {self.api_token}'
+            elif self.username and self.password:
+                auth = aiohttp.BasicAuth(self.username, self.password)
+
+            # Grafana's JSON compresses well. aiohttp already sends Accept-Encoding: gzip, deflate (plus br/zstd
+            # when those codecs are installed), so the header is left to it rather than narrowed here
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers, auth=auth,
+                                                 auto_decompress=True)
 
     async def cleanup_session(self):
         """Cleanup HTTP session"""
@@ -40,49 +109,42 @@ class GrafanaMCPServer:
             await self.session.close()
             self.session = None
 
-    async def make_grafana_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make a request to Grafana API"""
+    async def make_grafana_request(self, method: str, endpoint: str, raw: bool = False, **kwargs) -> Any:
+        """Make a request to Grafana API; with raw=True return the undecoded JSON body as bytes"""
         if not self.session:
             await self.initialize_session()
 
         url = f"{self.grafana_url}/api{endpoint}"
 
-        # Add authentication - prefer API token over basic auth
-        if self.api_token:
-            headers = kwargs.get('headers', {})
-            headers['Authorization'] = f'Bearer {self.api_token}'
-            kwargs['headers'] = headers
-        elif self.username and self.password:
-            from aiohttp import BasicAuth
-            kwargs['auth'] = BasicAuth(self.username, self.password)
-
         async with self.session.request(method, url, **kwargs) as response:
             if response.status >= 400:
                 error_text = await response.text()
                 raise Exception(f"Grafana API error {response.status}: {error_text}")
+            if raw:
+                return await response.read()
             return await response.json()
 
     async def list_dashboards(self) -> List[Dict[str, Any]]:
         """List all dashboards with pagination support"""
         try:
-            all_dashboards = []
-            page = 1
-            limit = 5000  # Set a high limit to try to get all dashboards
-
-            while True:
-                # Use pagination parameters to get all dashboards
-                result = await self.make_grafana_request('GET', f'/search?type=dash-db&limit={limit}&page={page}')
-
-                if not result:
-                    break
-
-                all_dashboards.extend(result)
-
-                # Check if we got fewer results than the limit (last page)
-                if len(result) < limit:
-                    break
-
-                page += 1
+            limit = DASHBOARD_PAGE_SIZE
+
+            # Use pagination parameters to get all dashboards; most instances fit in the first page
+            result = await self.make_grafana_request('GET', f'/search?type=dash-db&limit={limit}&page=1')
+            all_dashboards = list(result or [])
+            page = 2
+
+            # Check if we got fewer results than the limit (last page)
+            while result and len(result) == limit:
+                # Pages are independent, so fetch the next few at once; any past the end come back empty
+                batch = await asyncio.gather(*(
+                    self.make_grafana_request('GET', f'/search?type=dash-db&limit={limit}&page={p}')
+                    for p in range(page, page + DASHBOARD_PAGE_BATCH)))
+                for result in batch:
+                    all_dashboards.extend(result or [])
+                    if not result or len(result) < limit:
+                        break
+                page += DASHBOARD_PAGE_BATCH
 
             logger.info(f"Retrieved {len(all_dashboards)} dashboards from Grafana")
             return all_dashboards
@@ -90,14 +152,24 @@ class GrafanaMCPServer:
             logger.error(f"Failed to list dashboards: {e}")
             return []
 
-    async def get_dashboard(self, uid: str) -> Optional[Dict[str, Any]]:
-        """Get a specific dashboard by UID"""
+    async def get_dashboard(self, uid: str) -> Optional[bytes]:
+        """Get a specific dashboard by UID as Grafana's JSON bytes; concurrent calls for the same UID share one request"""
+        task = self._inflight.get(uid)
+        if task is None:
+            task = self._inflight[uid] = asyncio.create_task(self._fetch_dashboard(uid))
+        # Shielded so a cancelled caller doesn't cancel the fetch other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def _fetch_dashboard(self, uid: str) -> Optional[bytes]:
         try:
-            result = await self.make_grafana_request('GET', f'/dashboards/uid/{uid}')
+            # Passed through as-is: dashboards can be megabytes, and parsing them only to re-serialize is wasted work
+            result = await self.make_grafana_request('GET', f'/dashboards/uid/{uid}', raw=True)
             return result
         except Exception as e:
             logger.error(f"Failed to get dashboard {uid}: {e}")
             return None
+        finally:
+            del self._inflight[uid]
 
     async def list_datasources(self) -> List[Dict[str, Any]]:
         """List all datasources"""
@@ -114,6 +186,10 @@ class GrafanaMCPServer:
 
     async def get_tools_list(self) -> List[types.Tool]:
         """Get the list of available tools"""
+        return self.tools
+
+    def _build_tools(self) -> List[types.Tool]:
+        """Build the tool definitions"""
         return [
             types.Tool(
                 name="list_dashboards",
@@ -155,7 +231,7 @@ class GrafanaMCPServer:
             dashboards = await self.list_dashboards()
             return [types.TextContent(
                 type="text",
-                text=json.dumps(dashboards, indent=2)
+                text=orjson.dumps(dashboards).decode()
             )]
         elif name == "get_dashboard":
             uid = arguments.get("uid")
@@ -168,7 +244,7 @@ class GrafanaMCPServer:
             if dashboard:
                 return [types.TextContent(
                     type="text",
-                    text=json.dumps(dashboard, indent=2)
+                    text=dashboard.decode()
                 )]
             else:
                 return [types.TextContent(
@@ -179,7 +255,7 @@ class GrafanaMCPServer:
             datasources = await self.list_datasources()
             return [types.TextContent(
                 type="text",
-                text=json.dumps(datasources, indent=2)
+                text=orjson.dumps(datasources).decode()
             )]
         else:
             return [types.TextContent(
@@ -187,6 +263,19 @@ class GrafanaMCPServer:
                 text=f"Unknown tool: {name}"
             )]
 
+    async def _handle_initialize(self, params: Dict[str, Any]) -> bytes:
+        return INITIALIZE_RESULT
+
+    async def _handle_tools_list(self, params: Dict[str, Any]) -> bytes:
+        return self._tools_list_result
+
+    async def _handle_tools_call(self, params: Dict[str, Any]) -> bytes:
+        tool_name = params.get("name")
+        tool_args = params.get("arguments", {})
+        result = await self.execute_tool(tool_name, tool_args)
+        # Convert TextContent objects to dictionaries for JSON serialization
+        return orjson.dumps({"content": [{"type": content.type, "text": content.text} for content in result]})
+
     async def handle_jsonrpc_request(self, request: web.Request) -> web.Response:
         """Handle JSON-RPC requests"""
         try:
@@ -198,68 +287,20 @@ class GrafanaMCPServer:
                 params = data.get("params", {})
                 request_id = data["id"]
 
-                if method == "initialize":
-                    # Initialize response
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {
-                            "protocolVersion": "2024-11-05",
-                            "capabilities": {
-                                "tools": {"listChanged": True}
-                            },
-                            "serverInfo": {
-                                "name": "grafana-mcp",
-                                "version": "1.0.0"
-                            }
-                        }
-                    }
-                elif method == "tools/list":
-                    # List tools
-                    tools = await self.get_tools_list()
-                    # Convert Tool objects to dictionaries for JSON serialization
-                    tools_dict = []
-                    for tool in tools:
-                        tools_dict.append({
-                            "name": tool.name,
-                            "description": tool.description,
-                            "inputSchema": tool.inputSchema
-                        })
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"tools": tools_dict}
-                    }
-                elif method == "tools/call":
-                    # Call tool
-                    tool_name = params.get("name")
-                    tool_args = params.get("arguments", {})
-                    result = await self.execute_tool(tool_name, tool_args)
-                    # Convert TextContent objects to dictionaries for JSON serialization
-                    content_dict = []
-                    for content in result:
-                        content_dict.append({
-                            "type": content.type,
-                            "text": content.text
-                        })
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "result": {"content": content_dict}
-                    }
-                else:
-                    response = {
+                handler = self._dispatch.get(method)
+                if handler is None:
+                    return json_response({
                         "jsonrpc": "2.0",
                         "id": request_id,
                         "error": {
                             "code": -32601,
                             "message": f"Method {method} not found"
                         }
-                    }
+                    })
 
-                return web.json_response(response)
+                return result_response(request_id, await handler(params))
             else:
-                return web.json_response({
+                return json_response({
                     "jsonrpc": "2.0",
                     "error": {
                         "code": -32600,
@@ -269,7 +310,7 @@ class GrafanaMCPServer:
 
         except Exception as e:
             logger.error(f"Error handling request: {e}")
-            return web.json_response({
+            return json_response({
                 "jsonrpc": "2.0",
                 "error": {
                     "code": -32603,
@@ -295,21 +336,10 @@ async def main():
     server = GrafanaMCPServer(grafana_url, api_token, username, password)
     server.setup_tools()
 
-    app = web.Application()
+    # CORS middleware for cross-origin requests
+    app = web.Application(middlewares=[cors_middleware])
     app.router.add_post('/mcp', server.handle_jsonrpc_request)
 
-    # Add CORS middleware for cross-origin requests
-    async def cors_middleware(app, handler):
-        async def middleware(request):
-            response = await handler(request)
-            response.headers['Access-Control-Allow-Origin'] = '*'
-            response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
-            response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
-            return response
-        return middleware
-
-    app.middlewares.append(cors_middleware)
-
     # Handle OPTIONS requests for CORS
     async def handle_options(request):
         return web.Response(headers={
@@ -320,19 +350,27 @@ async def main():
 
     app.router.add_options('/mcp', handle_options)
 
+    # Set from SIGINT/SIGTERM, so the idle server sleeps instead of waking every second
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
     try:
-        runner = web.AppRunner(app)
-        await runner.setup()
+        # Open the Grafana connection pool up front instead of on the first request
+        await server.initialize_session()
+
         site = web.TCPSite(runner, '0.0.0.0', 8000)
         await site.start()
         logger.info("Grafana MCP HTTP server started on port 8000")
 
-        # Keep the server running
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
+        # Keep the server running until a shutdown signal arrives
+        await stop.wait()
         logger.info("Shutting down server...")
     finally:
+        await runner.cleanup()
         await server.cleanup_session()
 
 if __name__ == "__main__":
@@ -4,18 +4,55 @@ Direct test of Prometheus metrics querying
 Demonstrates CPU and memory metric queries directly against Prometheus
 """
 
-import requests
-import json
+import asyncio
 import sys
 
+import httpx
 
-def query_prometheus(endpoint, params=None):
-    """Make a request to Prometheus API"""
-    base_url = "http://localhost:9090"
-    url = f"{base_url}/api/v1/{endpoint}"
+# One long-lived client for every query, so concurrent requests share its keep-alive pool
+_client = httpx.AsyncClient(
+    base_url="http://localhost:9090",
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60),
+    timeout=30)
 
+CPU_QUERIES = [
+    ("Process CPU", "rate(process_cpu_user_seconds_total[5m])"),
+    ("System CPU Usage", "100 - (avg by(instance) (irate(node_cpu_seconds_total{mode='idle'}[5m])) * 100)"),
+    ("CPU Seconds Total", "rate(cpu_seconds_total{mode!='idle'}[5m])")
+]
+
+MEMORY_QUERIES = [
+    ("Process Memory", "process_resident_memory_bytes"),
+    ("Go Memory Alloc", "go_memstats_alloc_bytes"),
+    ("System Memory Used", "node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes"),
+    ("System Memory Usage %", "(1 - node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes) * 100")
+]
+
+RANGE_PARAMS = {
+    "query": "up",
+    "start": "2025-12-11T08:00:00Z",
+    "end": "2025-12-11T08:05:00Z",
+    "step": "1m"
+}
+
+
+def build_query(endpoint, params=None):
+    """Build a Prometheus API request, to be sent (possibly repeatedly) by query_prometheus"""
+    return _client.build_request("GET", f"/api/v1/{endpoint}", params=params)
+
+
+# Built once, so URLs and query strings are encoded here rather than on every send
+UP_REQUEST = build_query("query", {"query": "up"})
+METRICS_REQUEST = build_query("label/__name__/values")
+RANGE_REQUEST = build_query("query_range", RANGE_PARAMS)
+CPU_REQUESTS = [build_query("query", {"query": query}) for _, query in CPU_QUERIES]
+MEMORY_REQUESTS = [build_query("query", {"query": query}) for _, query in MEMORY_QUERIES]
+
+
+async def query_prometheus(request):
+    """Send a request built by build_query and return the Prometheus API data"""
     try:
-        response = requests.get(url, params=params)
+        response = await _client.send(request)
         response.raise_for_status()
         result = response.json()
 
@@ -28,20 +65,48 @@ def query_prometheus(endpoint, params=None):
         raise Exception(f"Prometheus request failed: {e}")
 
 
-def main():
+def print_first_match(queries, results):
+    """Report the first query (in priority order) that returned data; True if one did."""
+    for (name, query), result in zip(queries, results):
+        if isinstance(result, Exception):
+            print(f"️ {name} query failed: {result}")
+        elif result.get("result"):
+            values = result["result"]
+            print(f" {name} query successful")
+            print(f"   Returned {len(values)} result(s)")
+            sample = values[0]
+            metric_name = sample.get("metric", {}).get("__name__", "unknown")
+            metric_value = sample.get("value", [None, "N/A"])[1]
+            print(f"   Sample: {metric_name} = {metric_value}")
+            return True
+        else:
+            print(f"️ {name} query returned no results")
+    return False
+
+
+async def main():
     print(" Direct Prometheus Metrics Test")
     print("=" * 50)
 
     try:
+        # The queries are independent, so send them all at once and report in order
+        up, metrics, range_result, *results = await asyncio.gather(
+            *(query_prometheus(request) for request in
+              [UP_REQUEST, METRICS_REQUEST, RANGE_REQUEST, *CPU_REQUESTS, *MEMORY_REQUESTS]),
+            return_exceptions=True)
+        cpu_results, memory_results = results[:len(CPU_QUERIES)], results[len(CPU_QUERIES):]
+
         # Test basic connectivity
         print("\n Testing Prometheus connectivity...")
-        result = query_prometheus("query", {"query": "up"})
+        if isinstance(up, Exception):
+            raise up
         print(" Prometheus connection successful")
-        print(f"   Status: Server is {'up' if result['result'][0]['value'][1] == '1' else 'down'}")
+        print(f"   Status: Server is {'up' if up['result'][0]['value'][1] == '1' else 'down'}")
 
         # Test metrics listing
         print("\n Testing metrics listing...")
-        metrics = query_prometheus("label/__name__/values")
+        if isinstance(metrics, Exception):
+            raise metrics
         print(f" Found {len(metrics)} metrics")
         print("Sample metrics:")
         for i, metric in enumerate(metrics[:15]):
@@ -51,63 +116,14 @@ def main():
 
         # Test CPU metrics
         print("\n Testing CPU metrics queries...")
-        cpu_queries = [
-            ("Process CPU", "rate(process_cpu_user_seconds_total[5m])"),
-            ("System CPU Usage", "100 - (avg by(instance) (irate(node_cpu_seconds_total{mode='idle'}[5m])) * 100)"),
-            ("CPU Seconds Total", "rate(cpu_seconds_total{mode!='idle'}[5m])")
-        ]
-
-        cpu_found = False
-        for name, query in cpu_queries:
-            try:
-                result = query_prometheus("query", {"query": query})
-                if result.get("result"):
-                    values = result["result"]
-                    print(f" {name} query successful")
-                    print(f"   Returned {len(values)} result(s)")
-                    if values:
-                        sample = values[0]
-                        metric_name = sample.get("metric", {}).get("__name__", "unknown")
-                        metric_value = sample.get("value", [None, "N/A"])[1]
-                        print(f"   Sample: {metric_name} = {metric_value}")
-                        cpu_found = True
-                    break
-                else:
-                    print(f"️ {name} query returned no results")
-            except Exception as e:
-                print(f"️ {name} query failed: {e}")
+        cpu_found = print_first_match(CPU_QUERIES, cpu_results)
 
         if not cpu_found:
             print("️ No CPU metrics found - this is normal if Prometheus doesn't have system metrics")
 
         # Test memory metrics
         print("\n Testing memory metrics queries...")
-        memory_queries = [
-            ("Process Memory", "process_resident_memory_bytes"),
-            ("Go Memory Alloc", "go_memstats_alloc_bytes"),
-            ("System Memory Used", "node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes"),
-            ("System Memory Usage %", "(1 - node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes) * 100")
-        ]
-
-        memory_found = False
-        for name, query in memory_queries:
-            try:
-                result = query_prometheus("query", {"query": query})
-                if result.get("result"):
-                    values = result["result"]
-                    print(f" {name} query successful")
-                    print(f"   Returned {len(values)} result(s)")
-                    if values:
-                        sample = values[0]
-                        metric_name = sample.get("metric", {}).get("__name__", "unknown")
-                        metric_value = sample.get("value", [None, "N/A"])[1]
-                        print(f"   Sample: {metric_name} = {metric_value}")
-                        memory_found = True
-                    break
-                else:
-                    print(f"️ {name} query returned no results")
-            except Exception as e:
-                print(f"️ {name} query failed: {e}")
+        memory_found = print_first_match(MEMORY_QUERIES, memory_results)
 
         if not memory_found:
             print("️ No memory metrics found - this is normal if Prometheus doesn't have system metrics")
@@ -115,12 +131,9 @@ def main():
         # Test range queries
         print("\n Testing range queries...")
         try:
-            result = query_prometheus("query_range", {
-                "query": "up",
-                "start": "2025-12-11T08:00:00Z",
-                "end": "2025-12-11T08:05:00Z",
-                "step": "1m"
-            })
+            if isinstance(range_result, Exception):
+                raise range_result
+            result = range_result
             if result.get("result"):
                 values = result["result"]
                 print(" Range query successful")
@@ -152,7 +165,9 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        await _client.aclose()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict
 
 import structlog
@@ -16,6 +19,8 @@ def setup_logging() -> structlog.BoundLogger:
     # Configure structlog to use standard library logging
     structlog.configure(
         processors=[
+            # Drop records below the stdlib level before any rendering work
+            structlog.stdlib.filter_by_level,
             # Add timestamp to every log record
             structlog.stdlib.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
@@ -31,12 +36,18 @@ def setup_logging() -> structlog.BoundLogger:
         cache_logger_on_first_use=True,
     )
     
-    # Configure standard library logging to output to stderr
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stderr,
-        level=logging.INFO,
-    )
+    # Configure standard library logging to output to stderr, written by a background
+    # thread so request handlers never block on the stream
+    root = logging.getLogger()
+    if not root.handlers:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(logging.INFO)
     
     # Create and return the logger
     logger = structlog.get_logger("prometheus_mcp_server")
@@ -1,8 +1,10 @@
 #!/usr/bin/env python
+import os
 import sys
+import tempfile
 import uvicorn
 import dotenv
-from prometheus_mcp_server.server import config, server_config
+from prometheus_mcp_server.server import get_config, get_server_config, _METRICS_ENABLED
 from prometheus_mcp_server.logging_config import setup_logging
 
 # Initialize structured logging
@@ -14,6 +16,10 @@ def setup_environment():
     else:
         logger.info("Environment configuration loaded", source="environment variables", note="No .env file found")
 
+    # Re-read the settings now that .env is in the environment
+    get_config.cache_clear()
+    get_server_config.cache_clear()
+    config = get_config()
     if not config.url:
         logger.error(
             "Missing required configuration",
@@ -37,17 +43,28 @@ def run_server():
         logger.error("Environment setup failed, exiting")
         sys.exit(1)
 
+    server_config = get_server_config()
     logger.info("Starting Prometheus JSON-RPC Server",
             host=server_config.bind_host,
-            port=server_config.bind_port)
+            port=server_config.bind_port,
+            workers=server_config.workers)
 
-    # Start FastAPI server with uvicorn
+    # Each worker keeps its own metrics; prometheus_client's multiprocess mode merges them on /metrics
+    if _METRICS_ENABLED and server_config.workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-mcp-metrics-")
+        logger.info("Metrics multiprocess mode enabled", directory=os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+    # Start FastAPI server with uvicorn, on uvloop with the httptools parser (both from uvicorn[standard])
     uvicorn.run(
         "prometheus_mcp_server.server:app",
         host=server_config.bind_host,
         port=server_config.bind_port,
         reload=False,
-        log_level="info"
+        workers=server_config.workers,
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+        access_log=False
     )
 
 if __name__ == "__main__":
@@ -2,28 +2,65 @@
 
 import os
 import json
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import time
 from datetime import datetime
+from urllib.parse import urlencode
 
 import dotenv
-import requests
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from prometheus_mcp_server.logging_config import get_logger
+import httpx
+import ijson
+import orjson
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from prometheus_mcp_server.logging_config import setup_logging
 
 dotenv.load_dotenv()
 
 # Create FastAPI app
 app = FastAPI(title="Prometheus JSON-RPC Server", version="1.5.1")
 
-# Cache for metrics list to improve completion performance
-_metrics_cache = {"data": None, "timestamp": 0}
+# Opt-in HTTP request count, latency and size metrics on /metrics, leaving out the polled /health,
+# plus queueing metrics for the outbound Prometheus calls
+_METRICS_ENABLED = os.environ.get("ENABLE_METRICS", "False").lower() in ("true", "1", "yes")
+_queue_wait_seconds = _rejected_total = None
+if _METRICS_ENABLED:
+    from prometheus_client import Counter, Histogram
+    from prometheus_fastapi_instrumentator import Instrumentator
+    Instrumentator(
+        should_group_status_codes=True,
+        excluded_handlers=["/health", "/metrics"]
+    ).instrument(app, latency_lowr_buckets=(0.05, 0.1, 0.3, 1, 3, 5)).expose(app, endpoint="/metrics")
+    _queue_wait_seconds = Histogram(
+        "prom_queue_wait_seconds", "Time spent waiting for a Prometheus request slot",
+        buckets=(0.001, 0.01, 0.05, 0.1, 0.3, 1, 3, 10)
+    )
+    _rejected_total = Counter("prom_rejected_total", "Prometheus requests rejected after waiting too long for a slot")
+
+# Metric names by endpoint plus list_metrics pages by arguments, to improve completion performance.
+# Only touched from the event loop, so no lock is needed.
 _CACHE_TTL = 300  # 5 minutes
-
-# Get logger instance
-logger = get_logger()
+_cache = TTLCache(maxsize=256, ttl=_CACHE_TTL)
+# Target health goes stale fast, so scrape targets get a much shorter TTL
+_TARGETS_CACHE_TTL = 15
+_targets_cache = TTLCache(maxsize=1, ttl=_TARGETS_CACHE_TTL)
+# Matching metric names for recent filter patterns, e.g. an autocomplete paging through results
+_filter_cache = TTLCache(maxsize=32, ttl=_CACHE_TTL)
+_cache_stats = {"hits": 0, "misses": 0}
+# Outcome of the last Prometheus probe ("" when it succeeded), so frequent health polls share one probe
+_HEALTH_CACHE_TTL = 15
+_health_cache = TTLCache(maxsize=1, ttl=_HEALTH_CACHE_TTL)
+
+# Get logger instance; configured here too, as uvicorn workers import only this module
+logger = setup_logging()
+
+# Most calls accepted in one JSON-RPC batch
+MAX_BATCH = 100
 
 # JSON-RPC Models
 class JSONRPCRequest(BaseModel):
@@ -47,26 +84,29 @@ async def health_check() -> Dict[str, Any]:
         Health status including service information, configuration, and connectivity
     """
     try:
+        config = get_config()
         health_status = {
             "status": "healthy",
             "service": "prometheus-jsonrpc-server",
-            "version": "1.5.1",
+            "version": app.version,
             "timestamp": datetime.utcnow().isoformat(),
             "configuration": {
                 "prometheus_url_configured": bool(config.url)
-            }
+            },
+            "cache": {**_cache_stats, "entries": len(_cache) + len(_targets_cache)}
         }
 
         # Test Prometheus connectivity if configured
         if config.url:
-            try:
-                # Quick connectivity test
-                make_prometheus_request("query", params={"query": "up", "time": str(int(time.time()))})
+            if "up" not in _health_cache:
+                _health_cache["up"] = await probe_prometheus()
+            error = _health_cache.get("up", "")
+            if not error:
                 health_status["prometheus_connectivity"] = "healthy"
                 health_status["prometheus_url"] = config.url
-            except Exception as e:
+            else:
                 health_status["prometheus_connectivity"] = "unhealthy"
-                health_status["prometheus_error"] = str(e)
+                health_status["prometheus_error"] = error
                 health_status["status"] = "degraded"
         else:
             health_status["status"] = "unhealthy"
@@ -84,10 +124,55 @@ async def health_check() -> Dict[str, Any]:
             "timestamp": datetime.utcnow().isoformat()
         }
 
+_BATCH_RESPONSE = TypeAdapter(List[JSONRPCResponse])
+
+def rpc_response(body: Union[JSONRPCResponse, List[JSONRPCResponse]]) -> Response:
+    """Serialize JSON-RPC output straight to JSON bytes.
+
+    Returning the models to FastAPI would revalidate every result (often a large query
+    matrix) against the response model before serializing it.
+    """
+    if isinstance(body, JSONRPCResponse):
+        return Response(body.model_dump_json(), media_type="application/json")
+    return Response(_BATCH_RESPONSE.dump_json(body), media_type="application/json")
+
 # JSON-RPC endpoint
-@app.post("/jsonrpc")
-async def jsonrpc_endpoint(request: JSONRPCRequest) -> JSONRPCResponse:
-    """Handle JSON-RPC requests"""
+@app.post("/jsonrpc", response_model=Union[JSONRPCResponse, List[JSONRPCResponse]])
+async def jsonrpc_endpoint(request: Union[JSONRPCRequest, List[Any]]) -> Response:
+    """Handle a JSON-RPC request, or a JSON-RPC 2.0 batch of requests dispatched concurrently"""
+    if isinstance(request, JSONRPCRequest):
+        return rpc_response(await dispatch(request))
+
+    if not request:
+        return rpc_response(JSONRPCResponse(error={"code": -32600, "message": "Invalid Request: empty batch"}))
+    if len(request) > MAX_BATCH:
+        return rpc_response(JSONRPCResponse(
+            error={"code": -32600, "message": f"Invalid Request: batch exceeds {MAX_BATCH} calls"}
+        ))
+
+    results = await asyncio.gather(*(dispatch_batch_item(item) for item in request))
+    # Notifications (valid requests without an "id" member) get no response, and an
+    # all-notification batch gets no body
+    responses = [response for response, is_notification in results if not is_notification]
+    return rpc_response(responses) if responses else Response(status_code=204)
+
+async def dispatch_batch_item(item: Any) -> Tuple[JSONRPCResponse, bool]:
+    """Validate and dispatch one member of a batch.
+
+    Returns the response and whether the member was a notification. Invalid members are
+    never notifications, so they always get their own error response.
+    """
+    try:
+        request = JSONRPCRequest.model_validate(item)
+    except ValidationError:
+        return JSONRPCResponse(
+            error={"code": -32600, "message": "Invalid Request"},
+            id=item.get("id") if isinstance(item, dict) else None
+        ), False
+    return await dispatch(request), "id" not in item
+
+async def dispatch(request: JSONRPCRequest) -> JSONRPCResponse:
+    """Run a single JSON-RPC request"""
     try:
         # Validate JSON-RPC version
         if request.jsonrpc != "2.0":
@@ -100,24 +185,14 @@ async def jsonrpc_endpoint(request: JSONRPCRequest) -> JSONRPCResponse:
         method_name = request.method
         params = request.params or {}
 
-        if method_name == "health_check":
-            result = await health_check_method()
-        elif method_name == "execute_query":
-            result = await execute_query_method(**params)
-        elif method_name == "execute_range_query":
-            result = await execute_range_query_method(**params)
-        elif method_name == "list_metrics":
-            result = await list_metrics_method(**params)
-        elif method_name == "get_metric_metadata":
-            result = await get_metric_metadata_method(**params)
-        elif method_name == "get_targets":
-            result = await get_targets_method(**params)
-        else:
+        handler = _METHODS.get(method_name)
+        if handler is None:
             return JSONRPCResponse(
                 error={"code": -32601, "message": f"Method not found: {method_name}"},
                 id=request.id
             )
 
+        result = await handler(**params)
         return JSONRPCResponse(result=result, id=request.id)
 
     except Exception as e:
@@ -127,6 +202,21 @@ async def jsonrpc_endpoint(request: JSONRPCRequest) -> JSONRPCResponse:
             id=request.id
         )
 
+async def probe_prometheus() -> str:
+    """Check Prometheus readiness; returns "" when ready, else the error."""
+    try:
+        # Constant-time readiness endpoint, answered without evaluating a query
+        response = await _client.get(_urls().ready, timeout=httpx.Timeout(2, connect=1))
+        if response.status_code == 404:
+            # Older Prometheus without /-/ready
+            await make_prometheus_request("query", params={"query": "up"})
+            return ""
+        if response.status_code != 200:
+            return f"Prometheus not ready: HTTP {response.status_code}"
+        return ""
+    except Exception as e:
+        return str(e)
+
 # Method implementations
 async def health_check_method() -> Dict[str, Any]:
     """Health check method"""
@@ -146,20 +236,19 @@ async def execute_query_method(query: str, time: Optional[str] = None) -> Dict[s
     if time:
         params["time"] = time
 
-    logger.info("Executing instant query", query=query, time=time)
-    data = make_prometheus_request("query", params=params)
+    logger.debug("Executing instant query", query=query, time=time)
+    data = await make_prometheus_request("query", params=params)
 
     result = {
         "resultType": data["resultType"],
         "result": data["result"]
     }
 
-    if not config.disable_prometheus_links:
-        from urllib.parse import urlencode
+    if not get_config().disable_prometheus_links:
         ui_params = {"g0.expr": query, "g0.tab": "0"}
         if time:
             ui_params["g0.moment_input"] = time
-        prometheus_ui_link = f"{config.url.rstrip('/')}/graph?{urlencode(ui_params)}"
+        prometheus_ui_link = f"{_urls().ui}?{urlencode(ui_params)}"
         result["links"] = [{
             "href": prometheus_ui_link,
             "rel": "prometheus-ui",
@@ -192,24 +281,23 @@ async def execute_range_query_method(query: str, start: str, end: str, step: str
         "step": step
     }
 
-    logger.info("Executing range query", query=query, start=start, end=end, step=step)
+    logger.debug("Executing range query", query=query, start=start, end=end, step=step)
 
-    data = make_prometheus_request("query_range", params=params)
+    data = await make_prometheus_request("query_range", params=params, stream=True)
 
     result = {
         "resultType": data["resultType"],
         "result": data["result"]
     }
 
-    if not config.disable_prometheus_links:
-        from urllib.parse import urlencode
+    if not get_config().disable_prometheus_links:
         ui_params = {
             "g0.expr": query,
             "g0.tab": "0",
             "g0.range_input": f"{start} to {end}",
             "g0.step_input": step
         }
-        prometheus_ui_link = f"{config.url.rstrip('/')}/graph?{urlencode(ui_params)}"
+        prometheus_ui_link = f"{_urls().ui}?{urlencode(ui_params)}"
         result["links"] = [{
             "href": prometheus_ui_link,
             "rel": "prometheus-ui",
@@ -243,22 +331,31 @@ async def list_metrics_method(
         - offset: Current offset
         - has_more: Whether more metrics are available
     """
-    logger.info("Listing available metrics", limit=limit, offset=offset, filter_pattern=filter_pattern)
+    logger.debug("Listing available metrics", limit=limit, offset=offset, filter_pattern=filter_pattern)
 
-    data = make_prometheus_request("label/__name__/values")
+    key = ("list_metrics", filter_pattern, offset, limit)
+    result = _cache.get(key)
+    if result is not None:
+        _cache_stats["hits"] += 1
+        logger.debug("Using cached metrics page", offset=offset, limit=limit, filter_pattern=filter_pattern)
+        return result
+    _cache_stats["misses"] += 1
 
-    # Apply filter if provided
+    data = await make_cached_prometheus_request("label/__name__/values")
+
+    # Apply filter if provided; matches are kept per pattern, so paging through them is a slice
     if filter_pattern:
-        filtered_data = [m for m in data if filter_pattern.lower() in m.lower()]
-        logger.debug("Applied filter", original_count=len(data), filtered_count=len(filtered_data), pattern=filter_pattern)
-        data = filtered_data
+        matches = filter_metric_names(data, filter_pattern.lower())
+        logger.debug("Applied filter", original_count=len(data), filtered_count=len(matches), pattern=filter_pattern)
+    else:
+        matches = data
 
-    total_count = len(data)
+    total_count = len(matches)
 
     # Apply pagination
     start_idx = offset
-    end_idx = offset + limit if limit is not None else len(data)
-    paginated_data = data[start_idx:end_idx]
+    end_idx = offset + limit if limit is not None else total_count
+    paginated_data = matches[start_idx:end_idx]
 
     result = {
         "metrics": paginated_data,
@@ -267,6 +364,7 @@ async def list_metrics_method(
         "offset": offset,
         "has_more": end_idx < total_count
     }
+    _cache[key] = result
 
     logger.info("Metrics list retrieved",
                 total_count=total_count,
@@ -276,6 +374,24 @@ async def list_metrics_method(
 
     return result
 
+def lowercase_metric_names(data: List[str]) -> List[str]:
+    """Lowercased copy of the cached metric names, built once per cache refresh."""
+    cached = _cache.get("label/__name__/values:lower")
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    lowered = [m.lower() for m in data]
+    _cache["label/__name__/values:lower"] = (data, lowered)
+    return lowered
+
+def filter_metric_names(data: List[str], pattern: str) -> List[str]:
+    """Metric names containing the lowercase pattern, computed once per pattern and cache refresh."""
+    cached = _filter_cache.get(pattern)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    matches = [m for m, name in zip(data, lowercase_metric_names(data)) if pattern in name]
+    _filter_cache[pattern] = (data, matches)
+    return matches
+
 async def get_metric_metadata_method(metric: str) -> List[Dict[str, Any]]:
     """Get metadata about a specific metric.
 
@@ -285,9 +401,9 @@ async def get_metric_metadata_method(metric: str) -> List[Dict[str, Any]]:
     Returns:
         List of metadata entries for the metric
     """
-    logger.info("Retrieving metric metadata", metric=metric)
+    logger.debug("Retrieving metric metadata", metric=metric)
     endpoint = f"metadata?metric={metric}"
-    data = make_prometheus_request(endpoint, params=None)
+    data = await make_prometheus_request(endpoint, params=None)
     if "metadata" in data:
         metadata = data["metadata"]
     elif "data" in data:
@@ -305,8 +421,8 @@ async def get_targets_method() -> Dict[str, List[Dict[str, Any]]]:
     Returns:
         Dictionary with active and dropped targets information
     """
-    logger.info("Retrieving scrape targets information")
-    data = make_prometheus_request("targets")
+    logger.debug("Retrieving scrape targets information")
+    data = await make_cached_prometheus_request("targets", _targets_cache)
 
     result = {
         "activeTargets": data["activeTargets"],
@@ -319,47 +435,216 @@ async def get_targets_method() -> Dict[str, List[Dict[str, Any]]]:
 
     return result
 
-@dataclass
+# JSON-RPC method name -> implementation
+_METHODS: Dict[str, Callable[..., Awaitable[Any]]] = {
+    "health_check": health_check_method,
+    "execute_query": execute_query_method,
+    "execute_range_query": execute_range_query_method,
+    "list_metrics": list_metrics_method,
+    "get_metric_metadata": get_metric_metadata_method,
+    "get_targets": get_targets_method,
+}
+
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """Global Configuration for the server."""
     bind_host: str = "127.0.0.1"
     bind_port: int = 8080
+    workers: int = 2
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PrometheusConfig:
+    """Prometheus connection settings."""
     url: str
     url_ssl_verify: bool = True
     disable_prometheus_links: bool = False
+    max_concurrency: int = 8
+    max_qps: float = 20
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> PrometheusConfig:
+    """Prometheus settings from the environment, parsed on first call (cache_clear() to re-read)."""
+    return PrometheusConfig(
+        url=os.environ.get("PROMETHEUS_URL", ""),
+        url_ssl_verify=os.environ.get("PROMETHEUS_URL_SSL_VERIFY", "True").lower() in ("true", "1", "yes"),
+        disable_prometheus_links=os.environ.get("PROMETHEUS_DISABLE_LINKS", "False").lower() in ("true", "1", "yes"),
+        max_concurrency=int(os.environ.get("MCP_MAX_CONCURRENCY", "8")),
+        max_qps=float(os.environ.get("MCP_MAX_QPS", "20")),
+    )
+
+@functools.lru_cache(maxsize=1)
+def get_server_config() -> ServerConfig:
+    """HTTP server settings from the environment, parsed on first call (cache_clear() to re-read)."""
+    return ServerConfig(
+        bind_host=os.environ.get("PROMETHEUS_BIND_HOST", "127.0.0.1"),
+        bind_port=int(os.environ.get("PROMETHEUS_BIND_PORT", "8080")),
+        workers=int(os.environ.get("PROMETHEUS_WORKERS", max(2, (os.cpu_count() or 1) // 2)))
+    )
+
+def __getattr__(name: str) -> Any:
+    """Keep server.config and server.server_config importable; both resolve through the factories."""
+    if name == "config":
+        return get_config()
+    if name == "server_config":
+        return get_server_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@dataclass(frozen=True, slots=True)
+class _PrometheusURLs:
+    """Prometheus UI and API URL prefixes for one configured base URL."""
+    ui: str
+    api: str
+    ready: str
+
+@functools.lru_cache(maxsize=1)
+def _prometheus_urls(url: str) -> _PrometheusURLs:
+    """URL prefixes for url, built once per base URL so a re-read config gets fresh ones."""
+    base = url.rstrip('/')
+    return _PrometheusURLs(ui=f"{base}/graph", api=f"{base}/api/v1/", ready=f"{base}/-/ready")
+
+def _urls() -> _PrometheusURLs:
+    """URL prefixes for the current get_config().url."""
+    return _prometheus_urls(get_config().url)
+
+# Throttling and gateway errors retried by make_prometheus_request, with exponential backoff
+# from _RETRY_BACKOFF seconds up to _RETRY_BACKOFF_MAX
+_RETRY_STATUSES = {429, 502, 503, 504}
+_RETRIES = 3
+_RETRY_BACKOFF = 0.2
+_RETRY_BACKOFF_MAX = 5
+
+# Per-worker bounds on outbound Prometheus calls: at most max_concurrency in flight and
+# max_qps started per second. Calls that wait over _QUEUE_TIMEOUT seconds for a slot fail.
+_QUEUE_TIMEOUT = 10
+_sem: Optional[asyncio.Semaphore] = None
+_limiter: Optional[AsyncLimiter] = None
+
+# Streamed bodies at least this large, or of unknown size, are parsed as they arrive instead of buffered whole
+_STREAM_THRESHOLD = 256 * 1024
+_STREAM_CHUNK = 64 * 1024
+
+class _ChunkReader:
+    """File-like read() over an async byte iterator, as ijson's async parsers expect."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = b""
+
+    async def read(self, size=-1):
+        if size == 0:
+            return b""
+        if size < 0:
+            data = self._buffer + b"".join([chunk async for chunk in self._chunks])
+            self._buffer = b""
+            return data
+        if not self._buffer:
+            self._buffer = await anext(self._chunks, b"")
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
 
-config = PrometheusConfig(
-    url=os.environ.get("PROMETHEUS_URL", ""),
-    url_ssl_verify=os.environ.get("PROMETHEUS_URL_SSL_VERIFY", "True").lower() in ("true", "1", "yes"),
-    disable_prometheus_links=os.environ.get("PROMETHEUS_DISABLE_LINKS", "False").lower() in ("true", "1", "yes"),
-)
+# Each row of a query result, built on its own so the rest of the document is never held whole
+_RESULT_ITEM = "data.result.item"
 
-server_config = ServerConfig(
-    bind_host=os.environ.get("PROMETHEUS_BIND_HOST", "127.0.0.1"),
-    bind_port=int(os.environ.get("PROMETHEUS_BIND_PORT", "8080"))
-)
+async def read_json(response: httpx.Response, stream: bool = False) -> Any:
+    """Decode a JSON response body; with stream, large bodies are parsed incrementally by ijson.
 
-def make_prometheus_request(endpoint, params=None):
-    """Make a request to the Prometheus API."""
+    A streamed body is parsed event by event: result rows are built one at a time and put
+    back into the surrounding envelope, which is built from the remaining events.
+    """
+    length = response.headers.get("Content-Length")
+    if not stream or (length is not None and int(length) < _STREAM_THRESHOLD):
+        return orjson.loads(await response.aread())
+
+    envelope = ijson.ObjectBuilder()
+    rows = []
+    row = None
+    events = ijson.parse_async(_ChunkReader(response.aiter_bytes(_STREAM_CHUNK)), use_float=True)
+    async for prefix, event, value in events:
+        if row is not None:
+            row.event(event, value)
+            if prefix == _RESULT_ITEM and event in ("end_map", "end_array"):
+                rows.append(row.value)
+                row = None
+        elif prefix == _RESULT_ITEM and event in ("start_map", "start_array"):
+            row = ijson.ObjectBuilder()
+            row.event(event, value)
+        elif prefix == _RESULT_ITEM:
+            rows.append(value)  # Scalar and string results are flat arrays
+        else:
+            envelope.event(event, value)
+    if not hasattr(envelope, "value"):
+        raise ValueError("Empty response body")
+    data = envelope.value.get("data") if isinstance(envelope.value, dict) else None
+    if isinstance(data, dict) and "result" in data:
+        data["result"] = rows
+    return envelope.value
+
+# Shared async keep-alive connection pool, opened per worker at startup. Awaiting it keeps
+# concurrent JSON-RPC requests overlapping instead of queueing behind one blocking call.
+# httpx advertises Accept-Encoding: gzip, deflate (plus br/zstd when those packages are installed)
+# and decompresses transparently, so large label lists and matrices travel compressed.
+_client: Optional[httpx.AsyncClient] = None
+
+@app.on_event("startup")
+async def open_client() -> None:
+    """Open the pooled Prometheus client"""
+    global _client, _sem, _limiter
+    config = get_config()
+    _sem = asyncio.Semaphore(config.max_concurrency)
+    _limiter = AsyncLimiter(config.max_qps, 1)
+    _client = httpx.AsyncClient(
+        verify=config.url_ssl_verify,
+        headers={"Accept": "application/json", "User-Agent": f"prometheus-mcp-server/{app.version}"},
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=httpx.Timeout(30, connect=3)
+    )
+
+@app.on_event("shutdown")
+async def close_client() -> None:
+    """Close the pooled Prometheus connections"""
+    await _client.aclose()
+
+async def make_prometheus_request(endpoint, params=None, stream=False):
+    """Make a request to the Prometheus API, streaming the body parse for large responses if stream is set."""
+    config = get_config()
     if not config.url:
         logger.error("Prometheus configuration missing", error="PROMETHEUS_URL not set")
         raise ValueError("Prometheus configuration is missing. Please set PROMETHEUS_URL environment variable.")
     if not config.url_ssl_verify:
         logger.warning("SSL certificate verification is disabled. This is insecure and should not be used in production environments.", endpoint=endpoint)
 
-    url = f"{config.url.rstrip('/')}/api/v1/{endpoint}"
+    url = _urls().api + endpoint
 
     try:
         logger.debug("Making Prometheus API request", endpoint=endpoint, url=url, params=params)
 
-        # Make the request
-        response = requests.get(url, params=params, verify=config.url_ssl_verify)
-
-        response.raise_for_status()
-        result = response.json()
+        # Wait for a free slot, then make the request
+        queued = time.monotonic()
+        try:
+            await asyncio.wait_for(_sem.acquire(), _QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if _rejected_total:
+                _rejected_total.inc()
+            raise RuntimeError(f"Prometheus request not started within {_QUEUE_TIMEOUT}s, too many requests in flight")
+        try:
+            if _queue_wait_seconds:
+                _queue_wait_seconds.observe(time.monotonic() - queued)
+            for attempt in range(_RETRIES + 1):
+                async with _limiter:
+                    response = await _client.send(_client.build_request("GET", url, params=params), stream=True)
+                if response.status_code not in _RETRY_STATUSES or attempt == _RETRIES:
+                    break
+                await response.aread()  # Drain so the connection goes back to the pool
+                await asyncio.sleep(min(_RETRY_BACKOFF * 2 ** attempt, _RETRY_BACKOFF_MAX))
+            try:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                result = await read_json(response, stream)
+            finally:
+                await response.aclose()
+        finally:
+            _sem.release()
 
         if result["status"] != "success":
             error_msg = result.get('error', 'Unknown error')
@@ -371,39 +656,39 @@ def make_prometheus_request(endpoint, params=None):
             result_type = data_field.get("resultType")
         else:
             result_type = "list"
-        logger.debug("Prometheus API request successful", endpoint=endpoint, result_type=result_type)
+        logger.debug("Prometheus API request successful", endpoint=endpoint, result_type=result_type,
+                     content_encoding=response.headers.get("Content-Encoding", "identity"))
         return result["data"]
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error("HTTP request to Prometheus failed", endpoint=endpoint, url=url, error=str(e), error_type=type(e).__name__)
         raise
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, ijson.JSONError) as e:
         logger.error("Failed to parse Prometheus response as JSON", endpoint=endpoint, url=url, error=str(e))
         raise ValueError(f"Invalid JSON response from Prometheus: {str(e)}")
     except Exception as e:
         logger.error("Unexpected error during Prometheus request", endpoint=endpoint, url=url, error=str(e), error_type=type(e).__name__)
         raise
 
-def get_cached_metrics() -> List[str]:
+async def make_cached_prometheus_request(endpoint: str, cache: TTLCache = _cache) -> Any:
+    """make_prometheus_request for a parameterless endpoint, answered from cache while fresh."""
+    data = cache.get(endpoint)
+    if data is not None:
+        _cache_stats["hits"] += 1
+        logger.debug("Using cached Prometheus response", endpoint=endpoint)
+        return data
+    _cache_stats["misses"] += 1
+    data = await make_prometheus_request(endpoint)
+    cache[endpoint] = data
+    return data
+
+async def get_cached_metrics() -> List[str]:
     """Get metrics list with caching to improve performance.
 
     Returns cached metrics if available and not expired, otherwise fetches fresh data.
     """
-    current_time = time.time()
-
-    # Check if cache is valid
-    if _metrics_cache["data"] is not None and (current_time - _metrics_cache["timestamp"]) < _CACHE_TTL:
-        logger.debug("Using cached metrics list", cache_age=current_time - _metrics_cache["timestamp"])
-        return _metrics_cache["data"]
-
-    # Fetch fresh metrics
     try:
-        data = make_prometheus_request("label/__name__/values")
-        _metrics_cache["data"] = data
-        _metrics_cache["timestamp"] = current_time
-        logger.debug("Refreshed metrics cache", metric_count=len(data))
-        return data
+        return await make_cached_prometheus_request("label/__name__/values")
     except Exception as e:
         logger.error("Failed to fetch metrics for cache", error=str(e))
-        # Return cached data if available, even if expired
-        return _metrics_cache["data"] if _metrics_cache["data"] is not None else []
+        return []
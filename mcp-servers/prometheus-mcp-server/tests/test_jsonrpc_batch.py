@@ -0,0 +1,56 @@
+"""Tests for JSON-RPC 2.0 batch handling on /jsonrpc."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from prometheus_mcp_server import server
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client for the app with an "echo" method that returns its params."""
+    async def echo(**params):
+        return params
+
+    monkeypatch.setitem(server._METHODS, "echo", echo)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+def test_batch_with_valid_invalid_and_notification_members(client):
+    """Valid calls and invalid members are answered in order; only valid notifications are dropped."""
+    response = client.post("/jsonrpc", json=[
+        {"jsonrpc": "2.0", "method": "echo", "params": {"value": 1}, "id": 1},
+        {"jsonrpc": "2.0", "method": "echo", "params": {"value": 2}},
+        {"foo": 1},
+        {"jsonrpc": "2.0", "params": {}, "id": 3},
+        {"jsonrpc": "2.0", "method": "missing", "id": 4},
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [(item["id"], (item["error"] or {}).get("code")) for item in body] == [
+        (1, None), (None, -32600), (3, -32600), (4, -32601)
+    ]
+    assert body[0]["result"] == {"value": 1}
+
+def test_batch_of_invalid_members_gets_errors(client):
+    """Invalid members without an id still get -32600 responses with a null id."""
+    response = client.post("/jsonrpc", json=[{"foo": 1}, 5])
+
+    assert response.status_code == 200
+    assert [(item["id"], item["error"]["code"]) for item in response.json()] == [(None, -32600), (None, -32600)]
+
+def test_batch_of_notifications_has_no_body(client):
+    """A batch made only of valid notifications is answered with 204 and no body."""
+    response = client.post("/jsonrpc", json=[
+        {"jsonrpc": "2.0", "method": "echo"},
+        {"jsonrpc": "2.0", "method": "echo", "params": {"value": 2}},
+    ])
+
+    assert response.status_code == 204
+    assert response.content == b""
+
+def test_empty_batch_is_invalid(client):
+    """An empty batch is a single -32600 error."""
+    response = client.post("/jsonrpc", json=[])
+
+    assert response.json()["error"]["code"] == -32600
@@ -0,0 +1,94 @@
+"""Tests for the streamed parse of large Prometheus range query responses."""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+from aiolimiter import AsyncLimiter
+
+from prometheus_mcp_server import server
+
+RANGE_DATA = {
+    "resultType": "matrix",
+    "result": [
+        {"metric": {"__name__": "up", "instance": f"node-{i}:9100"},
+         "values": [[1700000000 + step * 15.5, str(step)] for step in range(100)]}
+        for i in range(100)
+    ]
+}
+
+def chunked(body: bytes, size: int = 1000):
+    """Async body without a Content-Length, delivered in small pieces like a chunked response."""
+    async def chunks():
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+    return chunks()
+
+@pytest.fixture
+def prometheus(monkeypatch):
+    """Point the server at a mocked Prometheus; the test sets the handler."""
+    state = {}
+
+    def handler(request):
+        return state["handler"](request)
+
+    monkeypatch.setenv("PROMETHEUS_URL", "http://prometheus:9090")
+    server.get_config.cache_clear()
+    monkeypatch.setattr(server, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(server, "_sem", asyncio.Semaphore(8))
+    monkeypatch.setattr(server, "_limiter", AsyncLimiter(100, 1))
+    yield state
+    server.get_config.cache_clear()
+
+@pytest.mark.asyncio
+async def test_execute_range_query_streams_chunked_response(prometheus):
+    """A chunked body over 64 KB goes through the incremental parse and comes back intact."""
+    body = orjson.dumps({"status": "success", "data": RANGE_DATA})
+    assert len(body) > 64 * 1024
+    prometheus["handler"] = lambda request: httpx.Response(200, content=chunked(body))
+
+    result = await server.execute_range_query_method("up", "1700000000", "1700001600", "15s")
+
+    assert result["resultType"] == "matrix"
+    assert result["result"] == RANGE_DATA["result"]
+    assert result["links"][0]["rel"] == "prometheus-ui"
+
+@pytest.mark.asyncio
+async def test_streamed_scalar_result_and_error_envelope(prometheus):
+    """Flat scalar results and Prometheus error envelopes survive the incremental parse."""
+    prometheus["handler"] = lambda request: httpx.Response(200, content=chunked(
+        b'{"status":"success","data":{"resultType":"scalar","result":[1700000000.5,"2"]}}', 7))
+    assert await server.make_prometheus_request("query_range", stream=True) == {
+        "resultType": "scalar", "result": [1700000000.5, "2"]}
+
+    prometheus["handler"] = lambda request: httpx.Response(200, content=chunked(
+        b'{"status":"error","errorType":"bad_data","error":"parse error"}', 7))
+    with pytest.raises(ValueError, match="parse error"):
+        await server.make_prometheus_request("query_range", stream=True)
+
+@pytest.mark.asyncio
+async def test_streamed_truncated_body_is_invalid_json(prometheus):
+    """A body cut off mid-document is reported as invalid JSON."""
+    body = orjson.dumps({"status": "success", "data": RANGE_DATA})
+    prometheus["handler"] = lambda request: httpx.Response(200, content=chunked(body[:-10]))
+    with pytest.raises(ValueError, match="Invalid JSON"):
+        await server.make_prometheus_request("query_range", stream=True)
+
+@pytest.mark.asyncio
+async def test_config_cache_clear_picks_up_new_url(prometheus, monkeypatch):
+    """After get_config.cache_clear() requests and UI links follow the new PROMETHEUS_URL."""
+    urls = []
+
+    def handler(request):
+        urls.append(str(request.url))
+        return httpx.Response(200, json={"status": "success", "data": {"resultType": "vector", "result": []}})
+    prometheus["handler"] = handler
+
+    monkeypatch.setenv("PROMETHEUS_URL", "http://other:9090/")
+    server.get_config.cache_clear()
+    result = await server.execute_query_method("up")
+
+    assert urls[0].startswith("http://other:9090/api/v1/query?")
+    assert result["links"][0]["href"].startswith("http://other:9090/graph?")
+    assert server.config.url == "http://other:9090/"
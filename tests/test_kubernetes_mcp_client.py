@@ -7,6 +7,7 @@ Tests the HTTP JSON-RPC interface of the Kubernetes MCP server
 import json
 import requests
 import sys
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 
 class KubernetesMCPClient:
@@ -14,6 +15,16 @@ class KubernetesMCPClient:
         self.base_url = base_url
         self.jsonrpc_url = f"{base_url}/jsonrpc"
         self.request_id = 1
+        # One keep-alive session for every call instead of a new connection per request
+        self.http = requests.Session()
+        self.http.headers.update({"Accept": "application/json"})
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+
+    def close(self):
+        """Close the pooled connections"""
+        self.http.close()
 
     def _make_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a JSON-RPC request to the MCP server"""
@@ -27,7 +38,7 @@ class KubernetesMCPClient:
         self.request_id += 1
 
         try:
-            response = requests.post(self.jsonrpc_url, json=payload, timeout=30)
+            response = self.http.post(self.jsonrpc_url, json=payload, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -37,7 +48,7 @@ class KubernetesMCPClient:
     def health_check(self) -> bool:
         """Check if the server is healthy"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.http.get(f"{self.base_url}/health", timeout=5)
             return response.status_code == 200 and response.json().get("status") == "ok"
         except:
             return False
@@ -78,6 +89,7 @@ def main():
         print(" Server is healthy")
     else:
         print(" Server is not responding")
+        client.close()
         sys.exit(1)
 
     print()
@@ -228,6 +240,7 @@ def main():
     print()
 
     print(" Test completed!")
+    client.close()
     
 if __name__ == "__main__":
     main()
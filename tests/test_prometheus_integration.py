@@ -4,6 +4,8 @@ Test script to verify Prometheus MCP client integration with configuration file
 """
 
 import asyncio
+import functools
+import io
 import sys
 import os
 
@@ -18,121 +20,121 @@ from app.tools.mcp_prometheus_client import (
     mcp_prometheus_execute_query
 )
 
-async def test_configuration_loading():
+async def test_configuration_loading(log):
     """Test that the configuration file is loaded correctly"""
-    print(" Testing Prometheus MCP Client Configuration Loading")
+    log(" Testing Prometheus MCP Client Configuration Loading")
 
     try:
         client = PrometheusMCPClient()
 
         # Test configuration loading
-        print(f" Configuration loaded: {len(client.available_tools)} tools available")
+        log(f" Configuration loaded: {len(client.available_tools)} tools available")
 
         # List available tools
-        print(" Available tools:")
+        log(" Available tools:")
         for tool_name, tool_config in client.available_tools.items():
-            print(f"  - {tool_name}: {tool_config.get('description', 'No description')}")
+            log(f"  - {tool_name}: {tool_config.get('description', 'No description')}")
 
         # Test get_available_tools method
         tools_info = client.get_available_tools()
-        print(f" Tools info retrieved: {tools_info['count']} tools")
+        log(f" Tools info retrieved: {tools_info['count']} tools")
 
         return True
 
     except Exception as e:
-        print(f" Configuration loading failed: {e}")
+        log(f" Configuration loading failed: {e}")
         return False
 
-async def test_health_check():
+async def test_health_check(log):
     """Test health check functionality"""
-    print("\n🩺 Testing Health Check")
+    log("\n🩺 Testing Health Check")
 
     try:
         result = await mcp_prometheus_health_check()
-        print(f" Health check result: {result[:100]}...")
+        log(f" Health check result: {result[:100]}...")
 
         # Try to parse as JSON
         import json
         parsed = json.loads(result)
         if isinstance(parsed, dict) and "status" in parsed:
-            print(f" Health check response parsed successfully: status={parsed.get('status')}")
+            log(f" Health check response parsed successfully: status={parsed.get('status')}")
         else:
-            print("️ Health check response format unexpected")
+            log("️ Health check response format unexpected")
 
         return True
 
     except Exception as e:
-        print(f" Health check failed: {e}")
+        log(f" Health check failed: {e}")
         return False
 
-async def test_list_metrics():
+async def test_list_metrics(log):
     """Test list metrics functionality"""
-    print("\n Testing List Metrics")
+    log("\n Testing List Metrics")
 
     try:
         result = await mcp_prometheus_list_metrics(limit=10)
-        print(f" List metrics result: {result[:100]}...")
+        log(f" List metrics result: {result[:100]}...")
 
         # Try to parse as JSON
         import json
         parsed = json.loads(result)
         if isinstance(parsed, dict) and "metrics" in parsed:
             metrics_count = len(parsed.get("metrics", []))
-            print(f" Metrics list parsed: {metrics_count} metrics returned")
+            log(f" Metrics list parsed: {metrics_count} metrics returned")
         else:
-            print("️ List metrics response format unexpected")
+            log("️ List metrics response format unexpected")
 
         return True
 
     except Exception as e:
-        print(f" List metrics failed: {e}")
+        log(f" List metrics failed: {e}")
         return False
 
-async def test_execute_query():
+async def test_execute_query(log):
     """Test query execution functionality"""
-    print("\n Testing Execute Query")
+    log("\n Testing Execute Query")
 
     try:
         # Test with a simple query
         result = await mcp_prometheus_execute_query("up")
-        print(f" Execute query result: {result[:100]}...")
+        log(f" Execute query result: {result[:100]}...")
 
         # Try to parse as JSON
         import json
         parsed = json.loads(result)
         if isinstance(parsed, dict) and "resultType" in parsed:
-            print(f" Query result parsed: resultType={parsed.get('resultType')}")
+            log(f" Query result parsed: resultType={parsed.get('resultType')}")
         else:
-            print("️ Execute query response format unexpected")
+            log("️ Execute query response format unexpected")
 
         return True
 
     except Exception as e:
-        print(f" Execute query failed: {e}")
+        log(f" Execute query failed: {e}")
         return False
 
-async def test_parameter_validation():
+async def test_parameter_validation(log):
     """Test parameter validation in execute_tool method"""
-    print("\n Testing Parameter Validation")
+    log("\n Testing Parameter Validation")
 
     try:
         client = await get_prometheus_mcp_client()
 
         # Test missing required parameter
         result = await client.execute_tool("execute_query", {})
-        print(f" Parameter validation working: {result.get('error', 'No error')[:50]}...")
+        log(f" Parameter validation working: {result.get('error', 'No error')[:50]}...")
 
         # Test valid parameters
         result = await client.execute_tool("health_check", {})
         if result.get("status") != "error":
-            print(" Valid tool execution successful")
+            log(" Valid tool execution successful")
         else:
-            print(f"️ Valid tool execution failed: {result.get('error')}")
+            log(f"️ Valid tool execution failed: {result.get('error')}")
 
         return True
 
     except Exception as e:
-        print(f" Parameter validation test failed: {e}")
+        log(f" Parameter validation test failed: {e}")
         return False
 
 async def main():
@@ -151,12 +153,25 @@ async def main():
     passed = 0
     total = len(tests)
 
-    for test in tests:
-        try:
-            if await test():
-                passed += 1
-        except Exception as e:
-            print(f" Test {test.__name__} crashed: {e}")
+    # Connect once up front so the concurrent tests share a verified client
+    try:
+        await get_prometheus_mcp_client()
+    except Exception as e:
+        print(f" Prometheus MCP server not reachable: {e}")
+
+    # The tests are independent, so run them concurrently; each one logs into its own
+    # buffer and the buffers are printed in order afterwards
+    buffers = [io.StringIO() for _ in tests]
+    results = await asyncio.gather(
+        *(test(functools.partial(print, file=buffer)) for test, buffer in zip(tests, buffers)),
+        return_exceptions=True
+    )
+    for test, buffer, result in zip(tests, buffers, results):
+        print(buffer.getvalue(), end="")
+        if isinstance(result, Exception):
+            print(f" Test {test.__name__} crashed: {result}")
+        elif result:
+            passed += 1
 
     print("\n" + "=" * 60)
     print(f" Test Results: {passed}/{total} tests passed")